@@ -0,0 +1,66 @@
+"""Measure `import gg` startup time against a budget.
+
+Each run imports the package in a fresh interpreter, so nothing is cached
+between samples. Exits non-zero when the median import exceeds the budget.
+
+    python benchmarks/import_time.py --runs 20 --budget 25
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+BUDGET_MS = 25
+
+SNIPPET = """
+import importlib, sys, time
+sys.path.insert(0, {parent!r})
+start = time.perf_counter()
+gg = importlib.import_module({module!r})
+{touch}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def measure(touch: str = "", runs: int = 10) -> list[float]:
+    code = SNIPPET.format(parent=os.path.dirname(ROOT), module=f"{PACKAGE}.gg", touch=touch)
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, help="median budget for `import gg` in ms")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {
+        "import": measure(runs=args.runs),
+        # first use of the game module pulls in pygame, pymunk and the ECS
+        "import+Game": measure("gg.Game", runs=args.runs),
+    }
+    report = {name: {"median_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples)} for name, samples in results.items()}
+    report["budget_ms"] = args.budget
+    within_budget = report["import"]["median_ms"] <= args.budget
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, stats in results.items():
+            print(f"{name:<12} median {statistics.median(stats):8.2f} ms   min {min(stats):8.2f} ms")
+        print(f"budget       {args.budget:8.2f} ms   {'ok' if within_budget else 'EXCEEDED'}")
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
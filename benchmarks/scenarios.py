@@ -0,0 +1,205 @@
+"""Scenario benchmarks for the ECS, physics, AI and renderer.
+
+Every scenario builds a headless Game from the real classes (Player, Enemy,
+Bullet, Wall, Dust) and times each phase of a frame. Drawing is measured on a
+real Screen backed by SDL's dummy video driver, so no window is opened.
+Results are scaling curves (size -> ms/frame per phase) printed as JSON.
+
+    python benchmarks/scenarios.py --scenario enemies --sizes 100 500 1000 2000
+    python benchmarks/scenarios.py --scenario all --frames 120 --output bench.json
+"""
+import argparse
+import importlib
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+gg = importlib.import_module(f"{os.path.basename(ROOT)}.gg")
+
+PHASES = ("ai", "decay", "physics", "step", "particles", "draw")
+
+# scenario -> how a single size maps onto entity counts
+SCENARIOS = {
+    "enemies": lambda n: dict(enemies=n),
+    "bullets": lambda n: dict(bullets=n),
+    "walls": lambda n: dict(walls=n),
+    "static": lambda n: dict(static=n),
+    "dust": lambda n: dict(dust=n),
+    "mixed": lambda n: dict(enemies=n // 4, bullets=n // 2, walls=n // 8, dust=n // 8),
+}
+
+
+class Scenario(gg.Game):
+    def __init__(self, enemies=0, bullets=0, walls=0, static=0, dust=0, draw=True, seed=0, ai_workers=None):
+        super().__init__("benchmark", headless=True)
+        # headless skips sprite placement, but the draw phase here still needs it
+        self.physics.sync_sprites = draw
+        self.rng = random.Random(seed)
+        self.decay = gg.System([gg.Decaying])
+        self.bullets = bullets
+        self.dust = dust
+        self.bullet_pool = gg.Pool(lambda: gg.Bullet(self, gg.Vec2(0, 0), gg.Vec2(4, 4), gg.Vec2(0, 0), gg.Vec2(0, 0)), bullets)
+
+        # keep density constant so AI neighbour counts don't grow with the world
+        total = max(1, enemies + bullets + walls + static)
+        self.extent = max(800, math.sqrt(total) * 60)
+
+        self.player = gg.Player(self, self.extent / 2, self.extent / 2)
+        self._add(self.player)
+        for _ in range(enemies):
+            self._add(gg.Enemy(self, self._random_point(), gg.Vec2(12, 12)))
+        for _ in range(walls):
+            self._add(gg.Wall(self, self._random_point(), gg.Vec2(40, 40)))
+        for _ in range(bullets):
+            self._spawn_bullet()
+
+        # the same 40x40 walls, merged onto the static body instead of one entity each
+        self.static = gg.StaticGeometry(self.space, 40, index=self.neighbours)
+        cells = int(self.extent // 40)
+        self.static.add_rects([(self.rng.randrange(cells) * 40, self.rng.randrange(cells) * 40, 40, 40) for _ in range(static)])
+
+        if draw:
+            self.screen = gg.Screen(self.screen.width, self.screen.height)
+            self.screen.index = self.neighbours
+            self.screen.camera = gg.Camera(self.player, self.screen.width, self.screen.height)
+            self.screen.camera.setmethod(gg.Follow(self.screen.camera, self.player))
+        self.draw = draw
+        # None keeps the serial Enemy.update path; 0 runs the array kernel inline
+        self.steering = gg.ParallelSteering(self, ai_workers) if ai_workers is not None else None
+        self._update_neighbours()
+
+    def _random_point(self):
+        return gg.Vec2(self.rng.uniform(0, self.extent), self.rng.uniform(0, self.extent))
+
+    def _add(self, entity):
+        self.entities.add(entity)
+        self.physics.add(entity)
+        if entity.has_component(gg.Decaying):
+            self.decay.add(entity)
+
+    def _spawn_bullet(self):
+        angle = self.rng.uniform(0, 2 * math.pi)
+        direction = gg.Vec2(math.cos(angle), math.sin(angle))
+        position = gg.Vec2(self.player.rect.center) + direction * 20
+        # registering is a no-op for recycled bullets, which rejoin their systems on acquire
+        self._add(self.bullet_pool.acquire(position, direction, direction * 30000))
+
+    def _spawn_dust(self):
+        self.add_particle_effect(gg.Dust(self._random_point(), (self.rng.choice((-1, 1)), self.rng.choice((-1, 1))), 20, self.particle_engine))
+
+    def frame(self) -> dict:
+        timings = {}
+        clock = time.perf_counter
+        self.clock.tick()
+
+        start = clock()
+        if self.steering is None:
+            for entity in self.entities.of_type(gg.ENEMY_TYPE | gg.PLAYER_TYPE):
+                entity.update()
+        else:
+            self.steering.update()
+            self.player.update()
+        timings["ai"] = clock() - start
+
+        start = clock()
+        self.decay.update(self.timestep.step)
+        for _ in self.bullet_pool.release_decayed():
+            self._spawn_bullet()
+        timings["decay"] = clock() - start
+
+        start = clock()
+        self.physics.update(self.timestep.step)
+        timings["physics"] = clock() - start
+
+        start = clock()
+        self._update_space(self.timestep.step)
+        timings["step"] = clock() - start
+
+        start = clock()
+        while len(self.particle_effects) < self.dust:
+            self._spawn_dust()
+        self._update_particles()
+        timings["particles"] = clock() - start
+
+        start = clock()
+        if self.draw:
+            self.screen.clear()
+            self.screen.drawGrid()
+            self.screen.draw_static(self.static)
+            self.screen.draw_entities(self.entities)
+            self._draw_particles()
+            self.screen.update()
+        timings["draw"] = clock() - start
+        return timings
+
+
+def run(scenario: str, size: int, frames: int, warmup: int, draw: bool, seed: int, ai_workers=None) -> dict:
+    game = Scenario(**SCENARIOS[scenario](size), draw=draw, seed=seed, ai_workers=ai_workers)
+    for _ in range(warmup):
+        game.frame()
+
+    samples = {phase: [] for phase in PHASES}
+    totals = []
+    for _ in range(frames):
+        timings = game.frame()
+        for phase in PHASES:
+            samples[phase].append(timings[phase] * 1000)
+        totals.append(sum(timings.values()) * 1000)
+
+    particles = game.particle_engine.live
+    if game.steering is not None:
+        game.steering.close()
+
+    totals.sort()
+    return {
+        "size": size,
+        "entities": len(game.entities),
+        "static_shapes": len(game.static),
+        "particles": particles,
+        "frame_ms": statistics.fmean(totals),
+        "frame_p95_ms": totals[min(len(totals) - 1, int(len(totals) * 0.95))],
+        "phases_ms": {phase: statistics.fmean(values) for phase, values in samples.items()},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=list(SCENARIOS) + ["all"], default="mixed")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500, 1000, 2000])
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-draw", dest="draw", action="store_false", help="skip the Screen drawing phase")
+    parser.add_argument("--ai-workers", type=int, help="steer enemies with ParallelSteering on this many processes (0 = inline)")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    results = []
+    for scenario in scenarios:
+        curve = [run(scenario, size, args.frames, args.warmup, args.draw, args.seed, args.ai_workers) for size in args.sizes]
+        results.append({"scenario": scenario, "frames": args.frames, "draw": args.draw, "ai_workers": args.ai_workers, "curve": curve})
+        for point in curve:
+            print(f"{scenario:<8} size {point['size']:>6}  {point['frame_ms']:9.2f} ms/frame", file=sys.stderr)
+
+    report = json.dumps({"python": sys.version.split()[0], "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,66 @@
-from .display import *
-from .game import *
-from .ecs import *
-from .gen import *
-from .player import *
-from .structures import *
-from .style import *
-from .world import *
-from .particles import *
\ No newline at end of file
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so `import gg`
+# doesn't pay for pygame, fonts or the ECS until something actually uses them.
+_EXPORTS = {
+    "chunks": ("Chunk", "ChunkGenerator", "ChunkPlan", "ChunkStreamer"),
+    "display": ("Auto", "Border", "CamScroll", "Camera", "Follow", "Grid", "HeadlessScreen", "Screen"),
+    "game": ("Game",),
+    "ecs": (
+        "ALL_TYPE", "BULLET_COLOR", "BULLET_NAME", "BULLET_TYPE", "DEATH_COLOR", "ENEMY_COLOR", "ENEMY_NAME", "ENEMY_TYPE",
+        "PLAYER_COLOR", "PLAYER_NAME", "PLAYER_TYPE", "STATIC_ID", "WALL_COLOR", "WALL_NAME", "WALL_TYPE",
+        "Accelerator", "Actor", "Archetype", "ArchetypeStorage", "Body", "Box", "Bullet", "Circle", "Component",
+        "Contact", "ContactBuffer", "Decaying", "Enemy", "Entity", "Model", "NPC", "ParallelSteering", "PhysicsSystem",
+        "Pool", "Rectangle", "Registry", "Segment", "SpatialHash", "StaticCell", "StaticGeometry", "Stats", "System", "Vertices", "Wall",
+        "Weapon",
+        "component_bit", "component_id", "generate_component_classmethods", "get", "merge_cells", "merge_rects", "point",
+        "signature_of", "vec2", "zero_damping",
+    ),
+    "gen": (
+        "SEED", "fbm", "flood_fill", "gen_color", "gen_colors", "gen_float", "gen_floats", "gen_intrange", "gen_intranges",
+        "gen_point", "gen_range", "gen_ranges", "gen_vec2", "gen_vec2s", "new_stream", "noise_seed", "perlin_noise",
+        "set_seed", "stream", "stream_key", "threshold", "value_noise",
+    ),
+    "ids": ("ENTITY_IDS", "EFFECT_IDS", "IdAllocator", "generation_of", "index_of", "make_id"),
+    "player": ("Player", "playerColor", "playerName"),
+    "profiler": ("NULL_PHASE", "Profiler", "percentile"),
+    "sprites": ("CIRCLE", "RECT", "ROTATIONS", "RotationCache", "STAMPS", "SURFACES", "StampCache", "SurfaceCache"),
+    "structures": ("GetAttr", "IterableObject", "Point", "Vec2", "angleof"),
+    "style": ("Color", "GGSTYLE", "STYLE"),
+    "timestep": ("SimulatedClock", "Timestep"),
+    "world": ("World",),
+    "particles": ("Dust", "ENGINE", "Emitter", "ParticleEffect", "ParticleEngine"),
+}
+
+# the ecs submodules were reachable as gg.physics, gg.components, ... through the
+# old `from .ecs import *`, so they stay reachable
+_ECS_MODULES = (
+    "actors", "archetypes", "collisions", "components", "crowds", "defaults", "entities", "obstacles", "physics",
+    "pools", "registry", "spatial", "statics", "systems",
+)
+
+# later modules win, matching the order the old star imports ran in
+_ATTRIBUTES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+# names in __all__ resolve through __getattr__, so `from gg import *` still works lazily
+__all__ = sorted(set(_ATTRIBUTES) | set(_EXPORTS) | set(_ECS_MODULES))
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return importlib.import_module(f".{name}", __name__)
+
+    if name in _ECS_MODULES:
+        value = importlib.import_module(f".ecs.{name}", __name__)
+        globals()[name] = value
+        return value
+
+    module = _ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from . import gen
+from . import ecs
+
+from . import structures
+Vec2 = structures.Vec2
+
+# plain data, so it can be generated off the main thread; pymunk and pygame objects
+# are only created when the chunk is built
+@dataclass
+class ChunkPlan:
+    coord: tuple[int, int]
+    walls: list = field(default_factory=list)
+    enemies: list = field(default_factory=list)
+    decor: list = field(default_factory=list)
+
+@dataclass
+class Chunk:
+    plan: ChunkPlan
+    entities: list = field(default_factory=list)
+    static: ecs.StaticGeometry = None
+
+    @property
+    def coord(self) -> tuple[int, int]:
+        return self.plan.coord
+
+@dataclass
+class ChunkGenerator:
+    size: int = 512
+    max_walls: int = 4
+    max_enemies: int = 2
+    max_decor: int = 12
+    wall_size: tuple[int, int] = (16, 160)
+    enemy_size: int = 12
+    seed: str = None
+
+    def generate(self, coord: tuple[int, int]) -> ChunkPlan:
+        # a fresh stream per chunk, so chunks come out the same in any order or process
+        rng = gen.new_stream(f"chunk:{coord[0]}:{coord[1]}", self.seed)
+        left, top = coord[0] * self.size, coord[1] * self.size
+        plan = ChunkPlan(coord)
+
+        def point(margin = 0):
+            x, y = rng.uniform(margin, self.size - margin, 2).tolist()
+            return (left + x, top + y)
+
+        def count(maximum):
+            return int(rng.integers(0, maximum, endpoint=True))
+
+        for _ in range(count(self.max_walls)):
+            width, height = rng.uniform(*self.wall_size, 2).tolist()
+            plan.walls.append(point(max(width, height) / 2) + (width, height))
+        for _ in range(count(self.max_enemies)):
+            plan.enemies.append(point(self.enemy_size) + (self.enemy_size,))
+        for _ in range(count(self.max_decor)):
+            shade, radius = int(rng.integers(20, 45, endpoint=True)), int(rng.integers(2, 6, endpoint=True))
+            plan.decor.append(point() + (radius, (shade, shade, shade)))
+        return plan
+
+class ChunkStreamer:
+    # chunks load in a square ring of `radius` around the view and unload one ring
+    # further out, so walking back and forth over a border doesn't thrash
+    def __init__(self, game, generator = None, radius = 1, workers = 1, max_builds = 2, cell_size = 16, tile_size = 128):
+        self.game = game
+        self.generator = generator if generator else ChunkGenerator()
+        self.radius = radius
+        self.cell_size = cell_size
+        self.tile_size = tile_size
+        self.max_builds = max_builds
+        self.enemy_factory = ecs.Enemy
+        self.chunks: dict[tuple, Chunk] = {}
+        self._pending = {}
+        self._ready: dict[tuple, ChunkPlan] = {}
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="chunks") if workers else None
+
+    @property
+    def size(self) -> int:
+        return self.generator.size
+
+    def coord_of(self, point) -> tuple[int, int]:
+        return int(point[0] // self.size), int(point[1] // self.size)
+
+    def wanted(self, center) -> list[tuple[int, int]]:
+        cx, cy = self.coord_of(center)
+        ring = range(-self.radius, self.radius + 1)
+        # nearest first, so the chunk under the camera is never queued behind the corners
+        return sorted(((cx + x, cy + y) for x in ring for y in ring), key=lambda coord: abs(coord[0] - cx) + abs(coord[1] - cy))
+
+    def update(self, center = None) -> None:
+        if center is None:
+            center = self.game.screen.view_rect.center
+        cx, cy = self.coord_of(center)
+
+        for coord in self.wanted(center):
+            if coord not in self.chunks and coord not in self._pending and coord not in self._ready:
+                self._request(coord)
+
+        def distant(coord):
+            return max(abs(coord[0] - cx), abs(coord[1] - cy)) > self.radius + 1
+
+        for coord in [coord for coord in self._pending if distant(coord)]:
+            self._pending.pop(coord).cancel()
+        for coord in [coord for coord in self._ready if distant(coord)]:
+            del self._ready[coord]
+        for coord in [coord for coord in self.chunks if distant(coord)]:
+            self.unload(coord)
+
+        self._build_ready()
+
+    def _request(self, coord) -> None:
+        if self._executor is None:
+            self._ready[coord] = self.generator.generate(coord)
+        else:
+            self._pending[coord] = self._executor.submit(self.generator.generate, coord)
+
+    def _build_ready(self) -> None:
+        for coord in [coord for coord, future in self._pending.items() if future.done()]:
+            self._ready[coord] = self._pending.pop(coord).result()
+
+        # building touches the space, so it happens here on the main thread, a few chunks a frame
+        for coord in list(self._ready)[:self.max_builds]:
+            plan = self._ready.pop(coord)
+            self.chunks[coord] = Chunk(plan, self.build(plan), self.build_static(plan))
+
+    def build(self, plan: ChunkPlan) -> list:
+        game = self.game
+        entities = []
+        if self.enemy_factory is not None:
+            entities += [self.enemy_factory(game, Vec2(x, y), Vec2(size, size)) for x, y, size in plan.enemies]
+        for entity in entities:
+            game.entities.add(entity)
+            game.physics.add(entity)
+        return entities
+
+    def build_static(self, plan: ChunkPlan) -> ecs.StaticGeometry:
+        # walls go on the static body, snapped to a grid that divides the chunk, so their
+        # surfaces and tiles come from a fixed set and stay inside the chunk's own tiles
+        game = self.game
+        static = ecs.StaticGeometry(game.space, self.cell_size, tile_size=self.tile_size, index=game.neighbours)
+        static.add_rects([(x - width / 2, y - height / 2, width, height) for x, y, width, height in plan.walls])
+        return static
+
+    def unload(self, coord) -> None:
+        chunk = self.chunks.pop(coord, None)
+        if chunk is None:
+            return
+        for entity in chunk.entities:
+            entity.destroy()
+        if chunk.static is not None:
+            chunk.static.clear()
+
+    def draw(self, screen) -> None:
+        for chunk in self.chunks.values():
+            screen.draw_static(chunk.static)
+        screen.draw_stamps([decor for chunk in self.chunks.values() for decor in chunk.plan.decor])
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+        self._ready.clear()
+        for coord in list(self.chunks):
+            self.unload(coord)
+
+    def __contains__(self, coord) -> bool:
+        return coord in self.chunks
+
+    def __len__(self) -> int:
+        return len(self.chunks)
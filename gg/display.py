@@ -1,5 +1,6 @@
-from turtle import position, width
+import math
 import pygame
+import numpy as np
 from dataclasses import dataclass
 
 from abc import ABC, abstractmethod
@@ -8,6 +9,7 @@ from . import structures
 Vec2 = structures.Vec2
 
 from . import style
+from . import sprites
 from . import ecs
 
 @dataclass
@@ -16,38 +18,31 @@ class Grid:
     height: int
     col: int
     rows: int
-    position: tuple[int, int]
-    surface: pygame.Surface
-    rect: pygame.Rect = None
-    _squares: list = None
+    background: tuple = (15, 15, 15, 120)
+    square: tuple = (10, 10, 10, 120)
     
-    def update(self):
-        self.rect.x = self.position[0]
-        self.rect.y = self.position[1]
+    _tiles = {}
+    
+    @property
+    def key(self) -> tuple:
+        return (self.width, self.height, self.col, self.rows, self.background, self.square)
+    
+    def render(self) -> pygame.Surface:
+        tile = Grid._tiles.get(self.key)
+        if tile is None:
+            tile = Grid._tiles[self.key] = self.generate_squares()
+        return tile
     
-    def generate_squares(self):
+    def generate_squares(self) -> pygame.Surface:
         square_size = self.square_size
-        coords = [0, 0]
-        self.rect = self.surface.get_rect()
-
-        self._squares = list()
-        self.surface.fill((15, 15, 15, 120))
+        surface = pygame.Surface((self.width, self.height))
+        surface.fill(self.background)
         for x in range(0, self.col):
             for y in range(0, self.rows):
                 if (x + y) % 2 == 0:
-                    square = {}
-                    surface = pygame.Surface(square_size).convert_alpha()
-                    surface.fill((10, 10, 10, 120))
-
-                    rect = surface.get_rect()
-                    rect.x = x * square_size[0] * 0.9
-                    rect.y = y * square_size[1] * 0.9
-                    square["surface"] = surface
-                    square["rect"] = rect
-                    square["coords"] = (x, y)
-                    self._squares.append(square)
-
-                    self.surface.blit(surface, (rect.x, rect.y))
+                    rect = pygame.Rect(x * square_size[0] * 0.9, y * square_size[1] * 0.9, square_size[0], square_size[1])
+                    surface.fill(self.square, rect)
+        return surface
         
     
     @property
@@ -59,105 +54,250 @@ class Screen:
     WIDTH = 800
     HEIGHT = 600
     
-    display = pygame.display.set_mode([WIDTH, HEIGHT])
-    canvas = pygame.Surface((WIDTH, HEIGHT))
+    display = None
+    canvas = None
     
     width: int = WIDTH
     height: int = HEIGHT
     
     camera = None
+    index = None
+    cull_margin: int = 64
+    stamps: sprites.StampCache = sprites.STAMPS
+    dirty: bool = False
+    max_dirty_rects: int = 256
     
     grid = None
-    grid_surface = None
 
     
-    def __init__(self, width = None, height = None, camera = None):
+    def __init__(self, width = None, height = None, camera = None, dirty = False):
         self.width = width if width else self.WIDTH
         self.height = height if height else self.HEIGHT
-        self.display = pygame.display.set_mode([width, height])
-        self.canvas = pygame.Surface((width, height))
+        self.display = pygame.display.set_mode([self.width, self.height])
+        self.canvas = pygame.Surface((self.width, self.height))
         self.camera = camera
-        self.grids = []
-        self.background_size = width, height
-        self.create_grid_background(width, height)
+        self.drawn = 0
+        self.culled = 0
+        self.dirty = dirty
+        self._full_redraw = True
+        self._dirty_rects = []
+        self._previous_rects = None
+        self._drawn_offset = None
+        self.create_grid_background(self.width, self.height)
         
     def create_grid_background(self, width, height):
-        col = 2
-        row = 2
-        grid_size = width, height
-        self.background_size = (width * col, height * row)
-        for x in range(0, col):
-            for y in range(0, row):
-                grid = Grid(grid_size[0], grid_size[1], 3, 3, (0, 0), pygame.Surface((grid_size[0], grid_size[1])))
-                grid.generate_squares()
-                grid.position = x * self.width, y * self.height
-                self.grids.append(grid)
-            
-            
+        self.grid = Grid(width, height, 3, 3)
+        self.grid.render()
+
+    @property
+    def background(self) -> pygame.Surface:
+        return self.grid.render()
         
+    @property
+    def view_rect(self) -> pygame.Rect:
+        if self.camera is not None:
+            return pygame.Rect(self.camera.offset.x, self.camera.offset.y, self.width, self.height)
+        return pygame.Rect(0, 0, self.width, self.height)
         
     def draw(self, entity):
+        if not entity.rect.colliderect(self.view_rect):
+            self.culled += 1
+            return
+        self.drawn += 1
         if self.camera is not None:
-            self.canvas.blit(entity.image, (entity.rect.x - self.camera.offset.x, entity.rect.y - self.camera.offset.y))
+            rect = self.canvas.blit(entity.image, (entity.rect.x - self.camera.offset.x, entity.rect.y - self.camera.offset.y))
         else:
-            self.canvas.blit(entity.image, (entity.rect.x, entity.rect.y))
+            rect = self.canvas.blit(entity.image, (entity.rect.x, entity.rect.y))
+        if self.dirty:
+            self._dirty_rects.append(rect)
         
-    def draw_particle(self, particle):
+    def draw_particles(self, *emitters):
+        emitters = [emitter for emitter in emitters if emitter.count]
+        if not emitters:
+            return
+        positions = np.concatenate([emitter.positions[:emitter.count] for emitter in emitters])
+        radii = np.concatenate([emitter.radii[:emitter.count] for emitter in emitters]).astype(int)
+
         if self.camera is not None:
-            particle_color_factor = ((particle.rad / 5) * 100)
-            pygame.draw.circle(self.canvas, (particle_color_factor % 90, particle_color_factor % 150, particle_color_factor % 150, particle_color_factor % 255), (particle.x - self.camera.offset.x, particle.y - self.camera.offset.y), particle.rad)
-        else:
-            if particle.rad > 0:
-                pygame.draw.circle(self.canvas, ecs.PLAYER_COLOR, (particle.x, particle.y), particle.rad)
-            
+            positions = positions - (self.camera.offset.x, self.camera.offset.y)
+        visible = (radii > 0) & (positions[:, 0] + radii >= 0) & (positions[:, 0] - radii < self.width) & (positions[:, 1] + radii >= 0) & (positions[:, 1] - radii < self.height)
+        positions, radii = positions[visible], radii[visible]
+        topleft = (positions - radii[:, None]).astype(int).tolist()
 
-        
+        buckets, bucket_of = np.unique(radii, return_inverse=True)
+        stamps = [self.stamps.get(rad, self._particle_color(rad)) for rad in buckets.tolist()]
+        rects = self.canvas.blits([(stamps[bucket], position) for bucket, position in zip(bucket_of.tolist(), topleft)], self.dirty)
+        if self.dirty:
+            self._dirty_rects.extend(rects)
+
+    # world-space (x, y, radius, color) circles, e.g. chunk decor, stamped in one blits call
+    def draw_stamps(self, stamps):
+        view = self.view_rect
+        blits = []
+        for x, y, radius, color in stamps:
+            if x + radius < view.left or x - radius >= view.right or y + radius < view.top or y - radius >= view.bottom:
+                continue
+            blits.append((self.stamps.get(radius, color), (int(x - radius - view.left), int(y - radius - view.top))))
+        rects = self.canvas.blits(blits, self.dirty)
+        if self.dirty:
+            self._dirty_rects.extend(rects)
+
+    def _particle_color(self, rad):
+        if self.camera is None:
+            return ecs.PLAYER_COLOR
+        particle_color_factor = ((rad / 5) * 100)
+        return (particle_color_factor % 90, particle_color_factor % 150, particle_color_factor % 150)
     
     def draw_entities(self, entities):
-        entities.draw(self.canvas)
+        if self.index is None:
+            for entity in entities:
+                self.draw(entity)
+            return
+
+        # the index holds centres: pad by the largest body so its edges aren't culled on screen
+        margin = max(self.cull_margin, math.ceil(self.index.max_extent))
+        view = self.view_rect.inflate(margin * 2, margin * 2)
+        visible = {entity.id for entity in self.index.query_rect(view.left, view.top, view.right, view.bottom)}
+        for entity in entities:
+            if entity.id in visible:
+                self.draw(entity)
+            elif entity in self.index:
+                self.culled += 1
+            else:
+                # not indexed (e.g. added since the last rebuild), so test its rect directly
+                self.draw(entity)
         
     def drawGrid(self):
-        for i, grid in enumerate(self.grids):
-            grid.update()
-            player = self.camera.player
-            velocity = player.get_body().model.body.velocity
-            difference = Vec2(grid.position[0] - self.camera.player.rect.x, grid.position[1] - self.camera.player.rect.y)
-            distance = difference.length()
+        if self._full_redraw:
+            self.canvas.blits(self._grid_fragments(self.canvas.get_rect()), False)
+            return
+        for rect in self._previous_rects:
+            self.canvas.blits(self._grid_fragments(rect), False)
 
-        
-            self.canvas.blit(grid.surface, (grid.rect.x - self.camera.offset.x, grid.rect.y - self.camera.offset.y))
-        
-            
-            limitX = grid.width
-            limitY = grid.height
-
-            
-            newPosition = [grid.position[0], grid.position[1]]
-
-            if velocity[0] > 0 and newPosition[0] < (self.camera.offset.x - limitX):
-                newPosition[0] += self.background_size[0]
-            
-            if velocity[1] > 0 and newPosition[1] < (self.camera.offset.y - limitY):
-                newPosition[1] += self.background_size[1]
-            
-            
-            if velocity[0] < 0 and newPosition[0] > (self.camera.offset.x + limitX):
-                newPosition[0] -= self.background_size[0]
-            
-            if velocity[1] < 0 and newPosition[1] > (self.camera.offset.y + limitY):
-                newPosition[1] -=  self.background_size[1]
-
-            grid.position = newPosition
+    # like the grid, a static layer only changes when the camera moves, so in dirty mode
+    # it is redrawn just where last frame's sprites were cleared
+    def draw_static(self, layer):
+        view = self.view_rect
+        regions = [self.canvas.get_rect()] if self._full_redraw else self._previous_rects
+        fragments = []
+        for region in regions:
+            world = region.move(view.left, view.top)
+            for tile_rect, tile in layer.tiles_in(world):
+                area = tile_rect.clip(world)
+                fragments.append((tile, (area.x - view.left, area.y - view.top), area.move(-tile_rect.x, -tile_rect.y)))
+        self.canvas.blits(fragments, False)
+
+    def _grid_fragments(self, region: pygame.Rect) -> list:
+        tile = self.background
+        tile_width, tile_height = tile.get_size()
+        offset_x, offset_y = (self.camera.offset.x, self.camera.offset.y) if self.camera is not None else (0, 0)
+
+        # the tiling is anchored to the world, so only the offset into one tile matters
+        start_x = (int(offset_x) + region.x) % tile_width
+        start_y = (int(offset_y) + region.y) % tile_height
+        fragments = []
+        y, area_y = region.top, start_y
+        while y < region.bottom:
+            fragment_height = min(tile_height - area_y, region.bottom - y)
+            x, area_x = region.left, start_x
+            while x < region.right:
+                fragment_width = min(tile_width - area_x, region.right - x)
+                fragments.append((tile, (x, y), pygame.Rect(area_x, area_y, fragment_width, fragment_height)))
+                x += fragment_width
+                area_x = 0
+            y += fragment_height
+            area_y = 0
+        return fragments
 
     def update(self):
         if self.camera:
             self.camera.scroll()
-        self.display.blit(self.canvas, (0, 0))
+        if not self.dirty:
+            self.display.blit(self.canvas, (0, 0))
+            return
 
+        if self._full_redraw or len(self._dirty_rects) > self.max_dirty_rects:
+            self.display.blit(self.canvas, (0, 0))
+            pygame.display.update()
+        else:
+            rects = self._merge_rects(self._previous_rects + self._dirty_rects)
+            for rect in rects:
+                self.display.blit(self.canvas, rect, rect)
+            pygame.display.update(rects)
+        self._previous_rects = self._dirty_rects
+        self._dirty_rects = []
 
+    def mark_dirty(self, rect: pygame.Rect) -> None:
+        if self.dirty:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    def _merge_rects(self, rects) -> list[pygame.Rect]:
+        bounds = self.canvas.get_rect()
+        merged = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect.w or not rect.h:
+                continue
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
     
     def clear(self, color = style.GGSTYLE.STONE):
-        self.canvas.fill(color)
+        self.drawn = 0
+        self.culled = 0
+        if self.dirty:
+            offset = (self.camera.offset.x, self.camera.offset.y) if self.camera is not None else (0, 0)
+            self._full_redraw = self._previous_rects is None or offset != self._drawn_offset
+            self._drawn_offset = offset
+        if self._full_redraw:
+            self.canvas.fill(color)
+            self._previous_rects = self._previous_rects or []
+            return
+        for rect in self._previous_rects:
+            self.canvas.fill(color, rect)
+
+class HeadlessScreen(Screen):
+    def __init__(self, width = None, height = None, camera = None, dirty = False):
+        self.width = width if width else self.WIDTH
+        self.height = height if height else self.HEIGHT
+        self.camera = camera
+        self.drawn = 0
+        self.culled = 0
+        self.dirty = False
+
+    def create_grid_background(self, width, height):
+        pass
+
+    def draw(self, entity):
+        pass
+
+    def draw_entities(self, entities):
+        pass
+
+    def draw_particles(self, *emitters):
+        pass
+
+    def draw_stamps(self, stamps):
+        pass
+
+    def draw_static(self, layer):
+        pass
+
+    def drawGrid(self):
+        pass
+
+    def mark_dirty(self, rect):
+        pass
+
+    def update(self):
+        if self.camera:
+            self.camera.scroll()
+
+    def clear(self, color = None):
+        pass
 
 class Camera:
     def __init__(self, player, width, height):
@@ -1,7 +1,14 @@
 from .actors import *
+from .archetypes import *
+from .collisions import *
 from .components import *
+from .crowds import *
 from .defaults import *
 from .entities import *
 from .obstacles import *
 from .physics import *
+from .pools import *
+from .registry import *
+from .spatial import *
+from .statics import *
 from .systems import *
\ No newline at end of file
@@ -1,4 +1,3 @@
-import random
 import pygame
 
 
@@ -12,6 +11,8 @@ Color = style.Color
 from .. import world
 World = world.World
 
+from .. import gen
+
 from . import defaults
 from . import entities
 
@@ -73,8 +74,23 @@ class Enemy(NPC):
         
         
     def update(self):
+        with self.game.profiler.phase("Enemy.update"):
+            self._steer()
+
+    # the result of steering computed elsewhere (see ParallelSteering): one summed move
+    # instead of one per target and neighbour
+    def apply_steering(self, x, y, max_acceleration, touched):
+        super().update()
+        self.max_acceleration = max_acceleration
+        # before move, so accelerate scales from the new max as it does in _steer
+        if touched:
+            self.get_accelerator().max_acceleration = max_acceleration
+        if x or y:
+            self.move(Vec2(x, y))
+
+    def _steer(self):
         super().update()
-        entities = self.game.entities.values()
+        entities = self.game.entities
 
         for target in self.targets:
             if target == self: continue
@@ -95,42 +111,53 @@ class Enemy(NPC):
                         speed += 4
                         
                     if difference.length() < (self.game.screen.width / 4):
-                        if random.randint(0, 100) < 5:
+                        if gen.stream("ai").integers(0, 100, endpoint=True) < 5:
                             speed += 4
 
                     if Color.is_same_rgb(ebody.color, self.game.style.GREEN):
                         speed *= -1
                     self.move(normal * speed)
                     
-        for entity in entities:
-            if entity == self: continue
-            
-            pbody = entity.get_body()
-            ebody = self.get_body()
-            difference = (pbody.position - ebody.position)
-            
-            if difference.length() == 0: continue
+        ebody = self.get_body()
+        position = ebody.position
+        neighbours = self.game.neighbours
+
+        nearby = neighbours.query_radius(position, 400, defaults.ENEMY_TYPE)
+        if len(nearby) < entities.count(defaults.ENEMY_TYPE):
+            self.max_acceleration = self._max_acceleration
 
-            normal = difference / difference.length()
+        # one difference vector per neighbour, scaled in place into the push direction
+        for entity in nearby:
+            if entity == self: continue
             
+            difference = entity.get_body().position - position
+            length = difference.length()
+            if length == 0: continue
 
-            if entity.name == defaults.ENEMY_NAME:
-                if difference.length() < 400:
-                    if difference.length() >= 200:
-                        self.max_acceleration += self._max_acceleration * 0.001
-                    else:
-                        self.max_acceleration += self._max_acceleration * 0.002
-                    self.move(normal * 0.5)
-                    self.get_accelerator().max_acceleration = self.max_acceleration
+            if length < 400:
+                if length >= 200:
+                    self.max_acceleration += self._max_acceleration * 0.001
                 else:
-                    self.max_acceleration = self._max_acceleration
-            elif entity.name == defaults.BULLET_NAME and difference.length() < 75:
-                if Color.is_same_rgb(ebody.color, self.game.style.RED):
-                    self.move(-normal * 8)
-                else: 
-                    self.move(-normal)
-            elif difference.length() < 75:
-                    self.move(-normal)
- 
-
-        
+                    self.max_acceleration += self._max_acceleration * 0.002
+                difference.scale_to_length(0.5)
+                self.move(difference)
+                self.get_accelerator().max_acceleration = self.max_acceleration
+            else:
+                self.max_acceleration = self._max_acceleration
+
+        flee = -8 if Color.is_same_rgb(ebody.color, self.game.style.RED) else -1
+        for entity in neighbours.query_radius(position, 75, defaults.BULLET_TYPE):
+            difference = entity.get_body().position - position
+            length = difference.length()
+            if length == 0 or length >= 75: continue
+
+            difference.scale_to_length(flee)
+            self.move(difference)
+
+        for entity in neighbours.query_radius(position, 75, exclude=defaults.ENEMY_TYPE | defaults.BULLET_TYPE):
+            difference = entity.get_body().position - position
+            length = difference.length()
+            if length == 0 or length >= 75: continue
+
+            difference.scale_to_length(-1)
+            self.move(difference)
@@ -0,0 +1,111 @@
+from typing import Iterator, List, Type
+
+from . import components
+from . import registry
+
+_Component = components.Component
+
+
+class Archetype:
+    signature: int
+    entities: list
+    columns: dict[str, list]
+
+    def __init__(self, signature: int, component_classes: List[Type[_Component]]):
+        self.signature = signature
+        self.entities = []
+        self.columns = {component_class.__name__: [] for component_class in component_classes}
+        self._rows = {}
+
+    def add(self, entity) -> None:
+        self._rows[entity.id] = len(self.entities)
+        self.entities.append(entity)
+        for name, column in self.columns.items():
+            column.append(entity._components[name])
+
+    def remove(self, entity) -> None:
+        # swap-remove so the columns stay dense
+        row = self._rows.pop(entity.id)
+        last = len(self.entities) - 1
+        if row != last:
+            moved = self.entities[last]
+            self.entities[row] = moved
+            for column in self.columns.values():
+                column[row] = column[last]
+            self._rows[moved.id] = row
+        self.entities.pop()
+        for column in self.columns.values():
+            column.pop()
+
+    def column(self, component_class: Type[_Component]) -> list:
+        return self.columns.get(component_class.__name__)
+
+    def has(self, *component_classes: Type[_Component]) -> bool:
+        mask = registry.signature_of(*component_classes)
+        return self.signature & mask == mask
+
+    def __contains__(self, entity) -> bool:
+        return entity.id in self._rows
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+
+class ArchetypeStorage:
+    component_classes: List[Type[_Component]]
+
+    def __init__(self, component_classes: List[Type[_Component]]):
+        self.component_classes = component_classes
+        self.mask = registry.signature_of(*component_classes)
+        self._archetypes: dict[int, Archetype] = {}
+        self._entity_to_archetype: dict = {}
+
+    def signature_of(self, entity) -> int:
+        return entity.signature & self.mask
+
+    def _archetype(self, signature: int) -> Archetype:
+        archetype = self._archetypes.get(signature)
+        if archetype is None:
+            component_classes = [component_class for component_class in self.component_classes if signature & registry.component_bit(component_class)]
+            archetype = self._archetypes[signature] = Archetype(signature, component_classes)
+        return archetype
+
+    def add(self, entity) -> None:
+        if entity.id in self._entity_to_archetype:
+            return
+        archetype = self._archetype(self.signature_of(entity))
+        archetype.add(entity)
+        self._entity_to_archetype[entity.id] = archetype
+        entity._indexes.append(self)
+
+    def remove(self, entity) -> None:
+        archetype = self._entity_to_archetype.pop(entity.id, None)
+        if archetype is None:
+            return
+        archetype.remove(entity)
+        entity._indexes.remove(self)
+
+    def reindex(self, entity) -> None:
+        archetype = self._entity_to_archetype.get(entity.id)
+        if archetype is None:
+            return
+        # the component objects may have been replaced even if the signature didn't change
+        archetype.remove(entity)
+        archetype = self._archetype(self.signature_of(entity))
+        archetype.add(entity)
+        self._entity_to_archetype[entity.id] = archetype
+
+    def archetypes(self, *component_classes: Type[_Component]) -> Iterator[Archetype]:
+        for archetype in self._archetypes.values():
+            if archetype.entities and archetype.has(*component_classes):
+                yield archetype
+
+    def __contains__(self, entity) -> bool:
+        return entity.id in self._entity_to_archetype
+
+    def __iter__(self):
+        for archetype in self._archetypes.values():
+            yield from archetype.entities
+
+    def __len__(self) -> int:
+        return len(self._entity_to_archetype)
@@ -0,0 +1,83 @@
+from typing import NamedTuple
+
+import pymunk
+
+from . import defaults
+
+
+class Contact(NamedTuple):
+    a: object
+    b: object
+    type_a: int
+    type_b: int
+    normal: tuple[float, float]
+
+    def other(self, entity_id):
+        return self.b if self.a == entity_id else self.a
+
+
+class ContactBuffer:
+    contacts: list[Contact]
+
+    def __init__(self, space: pymunk.Space = None, registry = None):
+        self.registry = registry
+        self.contacts = []
+        self._by_entity: dict[object, list[Contact]] = {}
+        if space is not None:
+            self.watch(space)
+
+    def watch(self, space: pymunk.Space, type_a: int = None, type_b: int = None) -> None:
+        if hasattr(space, "on_collision"):
+            space.on_collision(type_a, type_b, begin=self._record)
+            return
+
+        # pymunk < 7 hands out handler objects instead
+        if type_a is None:
+            handler = space.add_default_collision_handler()
+        elif type_b is None:
+            handler = space.add_wildcard_handler(type_a)
+        else:
+            handler = space.add_collision_handler(type_a, type_b)
+
+        def begin(arbiter, space, data):
+            self._record(arbiter, space, data)
+            return True
+        handler.begin = begin
+
+    def _record(self, arbiter: pymunk.Arbiter, space: pymunk.Space, data) -> None:
+        shape_a, shape_b = arbiter.shapes
+        a = getattr(shape_a, "entity_id", None)
+        b = getattr(shape_b, "entity_id", None)
+        if a is None or b is None:
+            return
+        normal = arbiter.normal
+        contact = Contact(a, b, shape_a.collision_type, shape_b.collision_type, (normal.x, normal.y))
+        self.contacts.append(contact)
+        self._by_entity.setdefault(a, []).append(contact)
+        self._by_entity.setdefault(b, []).append(contact)
+
+    def clear(self) -> None:
+        self.contacts.clear()
+        self._by_entity.clear()
+
+    def involving(self, entity_id) -> list[Contact]:
+        return self._by_entity.get(entity_id, [])
+
+    def between(self, type_a: int, type_b: int = defaults.ALL_TYPE) -> list[Contact]:
+        # contacts come back ordered so that `a` is the entity matching type_a
+        found = []
+        for contact in self.contacts:
+            if contact.type_a == type_a and (type_b == defaults.ALL_TYPE or contact.type_b == type_b):
+                found.append(contact)
+            elif contact.type_b == type_a and (type_b == defaults.ALL_TYPE or contact.type_a == type_b):
+                found.append(Contact(contact.b, contact.a, contact.type_b, contact.type_a, (-contact.normal[0], -contact.normal[1])))
+        return found
+
+    def entities(self, contact: Contact) -> tuple:
+        return self.registry.get(contact.a), self.registry.get(contact.b)
+
+    def __iter__(self):
+        return iter(self.contacts)
+
+    def __len__(self) -> int:
+        return len(self.contacts)
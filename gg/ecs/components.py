@@ -1,7 +1,6 @@
-import uuid
 import pygame
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from ..style import Color
 from ..structures import Vec2
@@ -11,9 +10,11 @@ Model = physics.Model
 vec2 = physics.vec2
 
 
-@dataclass
+# components are slotted: there are tens of thousands of them, and a __dict__ per
+# instance costs more than the state it holds
+@dataclass(slots=True)
 class Component:
-    entity_id = None
+    entity_id: int = field(default=None, init=False, repr=False, compare=False)
     def update(self, delta) -> None: pass
     
     @property
@@ -22,8 +23,14 @@ class Component:
     
     def update(self):
         pass
+
+    def activate(self) -> None:
+        pass
+
+    def deactivate(self) -> None:
+        pass
     
-@dataclass    
+@dataclass(slots=True)
 class Stats(Component):    
     health: int
     strength: int
@@ -46,23 +53,25 @@ class Stats(Component):
     def is_alive(self):
         return self.health >= 0
 
-@dataclass
+@dataclass(slots=True)
 class Accelerator(Component):
     acceleration: float
     max_acceleration: float 
     direction: Vec2 = None
     
     def __init__(self, acceleration = 0, max_acceleration = 0, direction = None):
+        # slots drop class defaults, so a hand-written __init__ sets every field
+        self.entity_id = None
         self.acceleration = acceleration
         self.max_acceleration = max_acceleration
-        self.direction = direction if direction else Vec2(0,0)
+        self.direction = Vec2(direction) if direction else Vec2(0,0)
     
     def update(self, delta):
         self.decelerate(delta)
 
     def decelerate(self, delta):
         self.acceleration = 0
-        self.direction = Vec2(0,0)
+        self.direction.update(0, 0)
         
     def accelerate(self, direction: Vec2):
         self.direction += direction
@@ -72,15 +81,24 @@ class Accelerator(Component):
     @property
     def velocity(self) -> Vec2:
         return Vec2(self.acceleration * self.direction.x, self.acceleration * self.direction.y)
-@dataclass
+@dataclass(slots=True)
 class Body(Component):
     model: Model
+    _position: Vec2 = field(init=False, repr=False, compare=False)
+    _size: Vec2 = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        self._position = Vec2()
+        self._size = vec2(self.model.size)
+
+    # position and size are views owned by the body: position is refreshed in place on
+    # every read, so copy it (Vec2(body.position)) to keep a value across steps
     def get_position(self) -> Vec2:
-        return vec2(self.model.body.position)
+        self._position.update(self.model.body.position)
+        return self._position
     
     def get_size(self) -> Vec2:
-        return vec2(self.model.size)
+        return self._size
     
     def get_angle(self) -> Vec2:
         return -self.model.body.angle
@@ -90,6 +108,12 @@ class Body(Component):
     
     def get_color(self) -> Color:
         return self.model.color
+
+    def activate(self) -> None:
+        self.model.add_to_space()
+
+    def deactivate(self) -> None:
+        self.model.remove_from_space()
     
     def get_velocity(self) -> Vec2:
         return self.model.body.velocity
@@ -116,23 +140,23 @@ class Body(Component):
 
     @property
     def bottom(self) -> float:
-        return self.position.y + self.model.size.y
+        return self.model.body.position.y + self._size.y
 
     @property
     def top(self) -> float:
-        return self.position.y
+        return self.model.body.position.y
     
     @property
     def left(self) -> float:
-        return self.position.x
+        return self.model.body.position.x
 
     @property
     def right(self) -> float:
-        return self.position.x + self.model.size.x
+        return self.model.body.position.x + self._size.x
 
-@dataclass
+@dataclass(slots=True)
 class Decaying(Component):    
-    entity = None
+    entity: object
     start: float
     clock: pygame.time.Clock
     is_dead: bool = False
@@ -140,12 +164,20 @@ class Decaying(Component):
     current: float = None
     
     def __init__(self, entity, start, clock, is_decaying=False, current=None): 
+        self.entity_id = None
         self.entity = entity
         self.start = start
         self.clock = clock
+        self.is_dead = False
         self.is_decaying = is_decaying
         self.current = current if current else self.start
 
+    def reset(self, start=None):
+        if start is not None:
+            self.start = start
+        self.current = self.start
+        self.is_dead = False
+
     def update(self):
         if self.is_dead: return
         
@@ -161,7 +193,7 @@ class Decaying(Component):
         self.entity.change_color((color[0], color[1],color[2], a))
 
 
-@dataclass
+@dataclass(slots=True)
 class Weapon(Component):
     damage: float
     fire_rate: float
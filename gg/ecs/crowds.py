@@ -0,0 +1,130 @@
+import weakref
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .. import gen
+from .. import steering
+
+from .. import style
+Color = style.Color
+
+from . import defaults
+from . import entities
+_Body = entities.Body
+
+def _release(executor, block):
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+    block.close()
+    block.unlink()
+
+# Runs every Enemy's steering in worker processes. Each update publishes one snapshot
+# of all bodies into shared memory, the workers steer disjoint slices of the enemies
+# against it, and the resulting move vectors are applied here on the main thread.
+class ParallelSteering:
+    def __init__(self, game, workers = None, capacity = 4096, context = "spawn"):
+        self.game = game
+        self.workers = multiprocessing.cpu_count() if workers is None else workers
+        self.context = context
+        self.capacity = 0
+        self._executor = None
+        self._block = None
+        self._finalizer = None
+        self._reserve(capacity)
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= self.capacity:
+            return
+        self.close()
+        self.capacity = capacity
+        self._block = shared_memory.SharedMemory(create=True, size=steering.layout_size(capacity))
+        self.header, self.rows, self.out = steering.views(self._block.buf, capacity)
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                self.workers, multiprocessing.get_context(self.context),
+                initializer=steering._attach, initargs=(self._block.name, capacity))
+        self._finalizer = weakref.finalize(self, _release, self._executor, self._block)
+
+    def snapshot(self) -> list:
+        game = self.game
+        enemies = list(game.entities.of_type(defaults.ENEMY_TYPE))
+        bullets, others = [], []
+        for entity in game.entities.query(_Body):
+            if entity.type == defaults.BULLET_TYPE:
+                bullets.append(entity)
+            elif entity.type != defaults.ENEMY_TYPE:
+                others.append(entity)
+        positions = [tuple(entity.get_body().model.body.position) for entity in others]
+        # static geometry has no entities, only cells in the neighbour index
+        for cell, x, y, _ in game.neighbours.static_entries():
+            others.append(cell)
+            positions.append((x, y))
+        count = len(enemies) + len(bullets) + len(others)
+        if count > self.capacity:
+            self._reserve(max(count, 2 * self.capacity))
+
+        # each section is sorted by its broadphase cell, so the kernel finds neighbours by range
+        def by_cell(section, cell_size, positions = None):
+            if positions is None:
+                positions = [tuple(entity.get_body().model.body.position) for entity in section]
+            positions = np.array(positions, dtype=float).reshape(-1, 2)
+            order = np.argsort(steering.cell_keys(positions, cell_size), kind="stable")
+            return [section[i] for i in order.tolist()], positions[order]
+
+        enemies, enemy_positions = by_cell(enemies, steering.ENEMY_RADIUS)
+        bullets, bullet_positions = by_cell(bullets, steering.AVOID_RADIUS)
+        others, other_positions = by_cell(others, steering.AVOID_RADIUS, positions)
+
+        palette = game.style
+        rows = self.rows
+        rows[:count, steering.X:steering.Y + 1] = np.concatenate((enemy_positions, bullet_positions, other_positions))
+        rows[:count, steering.TYPE] = [entity.type for entity in enemies + bullets + others]
+        for i, enemy in enumerate(enemies):
+            color = enemy.get_body().color
+            rows[i, steering.FLAGS] = (
+                steering.YELLOW * Color.is_same_rgb(color, palette.YELLOW)
+                | steering.GREEN * Color.is_same_rgb(color, palette.GREEN)
+                | steering.RED * Color.is_same_rgb(color, palette.RED))
+            rows[i, steering.MAX] = enemy.max_acceleration
+            rows[i, steering.BASE] = enemy._max_acceleration
+        # rolls are drawn here, so results don't depend on how the enemies are sliced
+        rows[:len(enemies), steering.ROLL] = gen.stream("ai").integers(0, 100, len(enemies), endpoint=True)
+
+        player = getattr(game, "player", None)
+        player_position = player.get_body().model.body.position if player is not None else (0, 0)
+        self.header[:] = (count, len(enemies), len(bullets), player is not None, player_position[0], player_position[1],
+                          game.screen.width, 0)
+        return enemies
+
+    def update(self) -> None:
+        with self.game.profiler.phase("ParallelSteering.update"):
+            enemies = self.snapshot()
+            count = len(enemies)
+            if count == 0:
+                return
+
+            if self._executor is None:
+                steering.steer(self.header, self.rows, self.out, 0, count)
+            else:
+                # a few slices per worker evens out slices that land in dense clusters
+                bounds = np.linspace(0, count, min(count, self.workers * 4) + 1).astype(int).tolist()
+                futures = [self._executor.submit(steering._run_slice, start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+                for future in futures:
+                    future.result()
+
+            for enemy, (x, y, max_acceleration, touched) in zip(enemies, self.out[:count].tolist()):
+                enemy.apply_steering(x, y, max_acceleration, touched)
+
+    def close(self) -> None:
+        # the array views pin the shared buffer, so they go before it is closed
+        self.header = self.rows = self.out = None
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._executor = None
+        self._block = None
+        self.capacity = 0
@@ -18,4 +18,7 @@ ALL_TYPE = 0
 BULLET_TYPE = 1
 PLAYER_TYPE = 2
 ENEMY_TYPE = 4
-WALL_TYPE = 8
\ No newline at end of file
+WALL_TYPE = 8
+
+# entity id reported for shapes on the static body, which have no entity
+STATIC_ID = -1
\ No newline at end of file
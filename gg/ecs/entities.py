@@ -1,12 +1,11 @@
 import pygame
-import uuid
-import math
 
 from typing import Type
 
 
 from . import components
 from . import defaults
+from . import registry
 
 Component = components.Component
 
@@ -32,22 +31,38 @@ Color = style.Color
 from .. import world
 World = world.World
 
+from .. import sprites
+
+from .. import ids
+IdAllocator = ids.IdAllocator
+ENTITY_IDS = ids.ENTITY_IDS
+
 
 
 class Entity(pygame.sprite.Sprite):
-    id: uuid.UUID
+    id: int
     name: str 
 
     _components: dict[str, Type[Component]]
     _image: pygame.Surface
+    signature: int
     
     type: int = defaults.ALL_TYPE
+    active: bool = True
+    ids: IdAllocator = ENTITY_IDS
+    surfaces: sprites.SurfaceCache = sprites.SURFACES
+    rotations: sprites.RotationCache = sprites.ROTATIONS
 
     def __init__(self, name: str, *components):
         super().__init__()
         self.name = name
-        self.id = uuid.uuid4()
+        self.id = self.ids.allocate()
         self._components = {}
+        self.signature = 0
+        self._indexes = []
+        self._rotated_from = None
+        self._rotated_step = None
+        self._parked = None
         self._create_image((0,0), (0,0,0))
         
         for component in components:
@@ -55,24 +70,61 @@ class Entity(pygame.sprite.Sprite):
                 continue
             self.add_component(component)
 
+    # images come from a shared cache, so they must never be drawn on in place
     def _create_image(self, size: tuple[int, int], color: tuple[0, 0, 0]) -> None:
-        self.image = pygame.Surface(size).convert_alpha()
-        self.image.fill(color)
-        self.rect = pygame.Rect = self.image.get_rect()
+        self.image = self.surfaces.get(size, color)
+        self.rect = self.image.get_rect()
         self._image = self.image
         
     def _update_image(self, size: tuple[int, int], color: tuple[0, 0, 0]):
-        self._image = pygame.Surface(size).convert_alpha()
-        self._image.fill(color)
+        self._image = self.surfaces.get(size, color)
 
             
     def rot_center(self, angle):
-        rot_image = pygame.transform.rotozoom(self._image, math.degrees(angle), 1)
+        step = self.rotations.quantize(angle)
+        if self._rotated_from is self._image and self._rotated_step == step:
+            return
+        self._rotated_from = self._image
+        self._rotated_step = step
+        
+        rot_image = self.rotations.get(self._image, step)
         rot_rect = rot_image.get_rect(center=self.rect.center)
         self.image = rot_image
         self.rect = rot_rect
         
         
+    # a deactivated entity leaves its registries, systems and sprite groups but keeps
+    # its components, so activate() can put it back without rebuilding anything
+    def deactivate(self) -> None:
+        if not self.active:
+            return
+        self.active = False
+        indexes = list(self._indexes)
+        for index in indexes:
+            index.remove(self)
+        self._parked = (indexes, self.groups())
+        self.kill()
+        for component in self._components.values():
+            component.deactivate()
+
+    def activate(self) -> None:
+        if self.active:
+            return
+        self.active = True
+        for component in self._components.values():
+            component.activate()
+        indexes, groups = self._parked or ((), ())
+        self._parked = None
+        for index in indexes:
+            index.add(self)
+        self.add(*groups)
+
+    # frees the id for reuse; handles still holding the old id are stale from here on
+    def destroy(self) -> None:
+        self.deactivate()
+        self._parked = None
+        self.ids.free(self.id)
+
     def _update_components(self):
         for component in self._get_components():
             component.update()  
@@ -81,6 +133,9 @@ class Entity(pygame.sprite.Sprite):
     def add_component(self, component: Component) -> None:
         component.entity_id = self.id
         self._components[component.class_name] = component
+        self.signature |= registry.component_bit(type(component))
+        for index in self._indexes:
+            index.reindex(self)
         
     def get_component(self, component_class: Type[Component]) -> Component:
         # print(f"\n\n{self}")
@@ -88,8 +143,8 @@ class Entity(pygame.sprite.Sprite):
         # print(f"result: {self._components.get(component_class.__name__)}\n\n")
         return self._components.get(component_class.__name__)
      
-    def has_component(self, component_class: str) -> bool:
-        return component_class.__name__ in self._components
+    def has_component(self, component_class: Type[Component]) -> bool:
+        return self.signature & registry.component_bit(component_class) != 0
               
     def get_components(self) -> dict[str, Type[Component]]:
         return self._components
@@ -138,6 +193,8 @@ def generate_component_classmethods(*component_classes: Component):
             if velocity: 
                 model.body.velocity = physics.point(velocity)
             model.shape.entity_id = self.id
+            # contacts report shape types, so they have to match the entity's
+            model.shape.collision_type = self.type
             self.add_component(Body(model))
             
         def _update_sprite_with_body(self):
@@ -152,11 +209,13 @@ def generate_component_classmethods(*component_classes: Component):
             
         def _handle_entity_collision(self):
             entities = self.game.entities
-            for entity in entities:
-                if entity == self:
-                    continue
-                
-                collide(self, entity)
+            for contact in self.game.contacts.involving(self.id):
+                other = entities.get(contact.other(self.id))
+                if other is not None:
+                    self.on_collision(other, contact)
+
+        def on_collision(self, other, contact):
+            pass
         
         def get_body(self: Entity):
             return self.get_component(Body)
@@ -175,6 +234,7 @@ def generate_component_classmethods(*component_classes: Component):
         setattr(entity_class, "_update_sprite_with_body", _update_sprite_with_body)
         setattr(entity_class, "_set_position", _set_position)
         setattr(entity_class, "_handle_entity_collision", _handle_entity_collision)
+        setattr(entity_class, "on_collision", on_collision)
         setattr(entity_class, "get_body", get_body)
         setattr(entity_class, "get_momentum", get_momentum)
         setattr(entity_class, "change_color", change_color)
@@ -276,61 +336,3 @@ def generate_component_classmethods(*component_classes: Component):
 #             self.velocity *= 0.8
 #         else: 
 #             self.velocity = Vec2(0,0)
-    
-
-def collide(entity: Entity, other: Entity):
-    entity_body = entity.get_body()
-    other_body = other.get_body()
-
-    if entity.rect.colliderect(other):
-        collision_tolerance_w = (min(entity_body.size.x, other_body.size.x) / max(entity_body.size.x, other_body.size.x))
-        collision_tolerance_h = (min(entity_body.size.y, other_body.size.y) / max(entity_body.size.y, other_body.size.y))
-        
-        entity_momentum = entity.get_momentum()
-        other_momentum = entity.get_momentum()
-        
-        # moving up
-        up_difference = other_body.bottom - entity_body.top
-        up_tolerance = collision_tolerance_h * abs(other_body.top - entity_body.bottom)
-        if abs(up_difference + entity.velocity.y) < up_tolerance and entity.velocity.y < 0:
-            entity_body.position.y += up_difference 
-            entity_body.v_collision = True
-                        
-            other.velocity.y = entity_momentum.y / other_body.mass
-            entity.velocity.y = other_momentum.y / entity_body.mass
-            
-        # moving down
-        down_difference = other_body.top - entity_body.bottom
-
-        down_tolerance = collision_tolerance_h * abs(other_body.bottom - entity_body.top)
-        if abs(down_difference + entity.velocity.y) < down_tolerance and entity.velocity.y > 0:
-            entity_body.position.y += down_difference
-            entity_body.v_collision = True
-                
-            other.velocity.y = entity_momentum.y / other_body.mass
-            entity.velocity.y = other_momentum.y / entity_body.mass
-
-        # moving left
-        left_difference = other_body.right - entity_body.left
-        left_tolerance = collision_tolerance_w * abs(other_body.left - entity_body.right)
-        
-        if abs(left_difference + entity.velocity.x) < left_tolerance and entity.velocity.x < 0:
-            entity_body.position.x += left_difference 
-            entity_body.h_collision = True
-
-            other.velocity.x = entity_momentum.x / other_body.mass
-            entity.velocity.x = other_momentum.x / entity_body.mass
-
-        # moving right
-        right_difference = other_body.left - entity_body.right
-        right_tolerance = collision_tolerance_w * abs(other_body.right - entity_body.left) 
-        if abs(right_difference + entity.velocity.x) < right_tolerance and entity.velocity.x > 0:
-            entity_body.position.x += right_difference 
-            entity_body.h_collision = True
-                    
-            other.velocity.x = entity_momentum.x / other_body.mass
-            entity.velocity.x = other_momentum.x / entity_body.mass
-  
-  
-
-        
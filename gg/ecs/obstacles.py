@@ -36,10 +36,21 @@ class Bullet(entities.Entity):
         self._set_decaying(2200, game.clock, True)
         # self._set_accelerator(speed, speed, direction)
         body = self.get_body()
-        body.model.apply_impulse(physics.point(force))
         body.model.body.velocity_func = zero_damping
-        body.model.body.angular_velocity = 20 * gen_range(-2, 2)
         body.model.shape.filter = pymunk.ShapeFilter(defaults.BULLET_TYPE)
         body.model.shape.collision_type = defaults.BULLET_TYPE
+        self.reset(position, initial_velocity, force)
+
+    # puts a pooled bullet back into its just-fired state without new bodies, shapes or surfaces
+    def reset(self, position, initial_velocity, force):
+        model = self.get_body().model
+        model.body.position = physics.point(position)
+        model.body.velocity = physics.point(initial_velocity)
+        model.body.force = 0, 0
+        model.body.torque = 0
+        model.body.angle = 0
+        model.apply_impulse(physics.point(force))
+        model.body.angular_velocity = 20 * gen_range(-2, 2)
+        model.color = defaults.BULLET_COLOR
+        self.get_decaying().reset()
         self._update_sprite_with_body()
-    
\ No newline at end of file
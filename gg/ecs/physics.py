@@ -1,5 +1,4 @@
 import pygame
-import uuid
 from dataclasses import dataclass
 import pymunk
 
@@ -73,6 +72,14 @@ class Model:
     
     def apply_impulse(self, force):
         self.body.apply_impulse_at_world_point(force, self.body.position)
+
+    def add_to_space(self):
+        if self.body.space is None:
+            self.space.add(self.body, self.shape)
+
+    def remove_from_space(self):
+        if self.body.space is not None:
+            self.space.remove(self.body, self.shape)
       
     
 @dataclass
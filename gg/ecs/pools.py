@@ -0,0 +1,61 @@
+from . import entities
+_Entity = entities.Entity
+_Decaying = entities.Decaying
+
+# Recycles entities that are spawned and destroyed in bulk. Released entities are
+# deactivated (out of the space, registries and sprite groups) and handed back out
+# by acquire() after reset(), so their bodies, shapes and surfaces are reused.
+class Pool:
+    def __init__(self, factory, size = 0, max_size = None):
+        self.factory = factory
+        self.max_size = max_size
+        self.created = 0
+        self.reused = 0
+        self._free: list[_Entity] = []
+        self._active: dict = {}
+
+        for _ in range(size):
+            entity = self._create()
+            entity.deactivate()
+            self._free.append(entity)
+
+    def _create(self) -> _Entity:
+        self.created += 1
+        return self.factory()
+
+    def acquire(self, *args, **kwargs) -> _Entity:
+        if self._free:
+            entity = self._free.pop()
+            self.reused += 1
+        else:
+            entity = self._create()
+        entity.activate()
+        entity.reset(*args, **kwargs)
+        self._active[entity.id] = entity
+        return entity
+
+    def release(self, entity: _Entity) -> None:
+        if self._active.pop(entity.id, None) is None:
+            return
+        if self.max_size is not None and len(self._free) >= self.max_size:
+            entity.destroy()
+            return
+        entity.deactivate()
+        self._free.append(entity)
+
+    def release_decayed(self) -> list[_Entity]:
+        decayed = [entity for entity in self._active.values() if entity.get_component(_Decaying).is_dead]
+        for entity in decayed:
+            self.release(entity)
+        return decayed
+
+    @property
+    def active(self) -> list[_Entity]:
+        return list(self._active.values())
+
+    @property
+    def free(self) -> int:
+        return len(self._free)
+
+    def __len__(self) -> int:
+        return len(self._active)
@@ -0,0 +1,118 @@
+from typing import Iterator, Type
+
+from . import components
+from . import defaults
+
+_Component = components.Component
+
+_component_ids: dict[type, int] = {}
+
+def component_id(component_class: Type[_Component]) -> int:
+    id = _component_ids.get(component_class)
+    if id is None:
+        id = _component_ids[component_class] = len(_component_ids)
+    return id
+
+def component_bit(component_class: Type[_Component]) -> int:
+    return 1 << component_id(component_class)
+
+def signature_of(*component_classes: Type[_Component]) -> int:
+    signature = 0
+    for component_class in component_classes:
+        signature |= component_bit(component_class)
+    return signature
+
+
+class Registry:
+    def __init__(self, entities = None):
+        self._entities = {}
+        self._by_signature: dict[int, dict] = {}
+        self._by_type: dict[int, dict] = {}
+        self._indexed = {}
+
+        if entities is not None:
+            for entity in entities:
+                self.add(entity)
+
+    def add(self, entity) -> None:
+        if entity.id in self._entities:
+            return
+        self._entities[entity.id] = entity
+        self._index(entity)
+        entity._indexes.append(self)
+
+    def remove(self, entity) -> None:
+        if self._entities.pop(entity.id, None) is None:
+            return
+        self._unindex(entity)
+        entity._indexes.remove(self)
+
+    def reindex(self, entity) -> None:
+        signature, type = self._indexed[entity.id]
+        if signature == entity.signature and type == entity.type:
+            return
+        self._unindex(entity)
+        self._index(entity)
+
+    def _index(self, entity) -> None:
+        signature, type = entity.signature, entity.type
+        self._by_signature.setdefault(signature, {})[entity.id] = entity
+        self._by_type.setdefault(type, {})[entity.id] = entity
+        self._indexed[entity.id] = (signature, type)
+
+    def _unindex(self, entity) -> None:
+        signature, type = self._indexed.pop(entity.id)
+        bucket = self._by_signature[signature]
+        del bucket[entity.id]
+        if not bucket:
+            del self._by_signature[signature]
+        bucket = self._by_type[type]
+        del bucket[entity.id]
+        if not bucket:
+            del self._by_type[type]
+
+    def get(self, entity_id):
+        return self._entities.get(entity_id)
+
+    def query(self, *component_classes: Type[_Component]) -> Iterator:
+        mask = signature_of(*component_classes)
+        for signature, bucket in list(self._by_signature.items()):
+            if signature & mask == mask:
+                yield from list(bucket.values())
+
+    def of_type(self, type_mask: int = defaults.ALL_TYPE, exclude: int = 0) -> Iterator:
+        for type, bucket in list(self._by_type.items()):
+            if type_mask != defaults.ALL_TYPE and not type & type_mask:
+                continue
+            if type & exclude:
+                continue
+            yield from list(bucket.values())
+
+    def count(self, type_mask: int = defaults.ALL_TYPE) -> int:
+        if type_mask == defaults.ALL_TYPE:
+            return len(self._entities)
+        return sum(len(bucket) for type, bucket in self._by_type.items() if type & type_mask)
+
+    def values(self):
+        return self._entities.values()
+
+    def keys(self):
+        return self._entities.keys()
+
+    def __getitem__(self, entity_id):
+        return self._entities[entity_id]
+
+    def __setitem__(self, entity_id, entity) -> None:
+        self.add(entity)
+
+    def __delitem__(self, entity_id) -> None:
+        self.remove(self._entities[entity_id])
+
+    def __contains__(self, entity) -> bool:
+        return getattr(entity, "id", entity) in self._entities
+
+    def __iter__(self):
+        return iter(list(self._entities.values()))
+
+    def __len__(self) -> int:
+        return len(self._entities)
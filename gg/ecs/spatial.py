@@ -0,0 +1,106 @@
+import math
+
+from . import defaults
+
+
+class SpatialHash:
+    cell_size: float
+
+    def __init__(self, cell_size: float = 100):
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], list] = {}
+        # static geometry is inserted once and survives rebuilds
+        self._static: dict[tuple[int, int], list] = {}
+        # entries are centres, so rect queries that must catch any overlap pad by this
+        self.max_extent = 0.0
+        self._ids = set()
+
+    def cell_of(self, point) -> tuple[int, int]:
+        return math.floor(point[0] / self.cell_size), math.floor(point[1] / self.cell_size)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._ids.clear()
+        self.max_extent = 0.0
+
+    def insert(self, entity, point, extent: float = 0) -> None:
+        if extent > self.max_extent:
+            self.max_extent = extent
+        self._ids.add(entity.id)
+        x, y = point[0], point[1]
+        key = (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = []
+        cell.append((entity, x, y, entity.type))
+
+    def insert_static(self, entity, point) -> None:
+        x, y = point[0], point[1]
+        self._static.setdefault(self.cell_of(point), []).append((entity, x, y, entity.type))
+
+    def remove_static(self, entities) -> None:
+        entities = set(entities)
+        for key in list(self._static):
+            cell = [entry for entry in self._static[key] if entry[0] not in entities]
+            if cell:
+                self._static[key] = cell
+            else:
+                del self._static[key]
+
+    def static_entries(self):
+        for cell in self._static.values():
+            yield from cell
+
+    def rebuild(self, entities) -> None:
+        self.clear()
+        for entity in entities:
+            body = entity.get_body() if hasattr(entity, "get_body") else None
+            if body is None:
+                continue
+            # bounding radius, so a rotated body is still covered
+            size = body.get_size()
+            self.insert(entity, body.model.body.position, math.hypot(size.x, size.y) / 2)
+
+    def _candidates(self, left, top, right, bottom):
+        cell_size = self.cell_size
+        cells = self._cells
+        static = self._static
+        for cx in range(math.floor(left / cell_size), math.floor(right / cell_size) + 1):
+            for cy in range(math.floor(top / cell_size), math.floor(bottom / cell_size) + 1):
+                cell = cells.get((cx, cy))
+                if cell is not None:
+                    yield from cell
+                if static:
+                    cell = static.get((cx, cy))
+                    if cell is not None:
+                        yield from cell
+
+    def query_radius(self, point, radius: float, type_mask: int = defaults.ALL_TYPE, exclude: int = 0) -> list:
+        x, y = point[0], point[1]
+        radius_squared = radius * radius
+        found = []
+        for entity, ex, ey, type in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            if type_mask != defaults.ALL_TYPE and not type & type_mask:
+                continue
+            if type & exclude:
+                continue
+            if (ex - x) ** 2 + (ey - y) ** 2 <= radius_squared:
+                found.append(entity)
+        return found
+
+    def query_rect(self, left: float, top: float, right: float, bottom: float, type_mask: int = defaults.ALL_TYPE, exclude: int = 0) -> list:
+        found = []
+        for entity, x, y, type in self._candidates(left, top, right, bottom):
+            if type_mask != defaults.ALL_TYPE and not type & type_mask:
+                continue
+            if type & exclude:
+                continue
+            if left <= x <= right and top <= y <= bottom:
+                found.append(entity)
+        return found
+
+    def __contains__(self, entity) -> bool:
+        return getattr(entity, "id", entity) in self._ids
+
+    def __len__(self) -> int:
+        return sum(len(cell) for cell in self._cells.values()) + sum(len(cell) for cell in self._static.values())
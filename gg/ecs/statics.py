@@ -0,0 +1,138 @@
+import numpy as np
+import pygame
+import pymunk
+
+from .. import structures
+Vec2 = structures.Vec2
+
+from . import defaults
+
+# Greedy rectangle meshing: take the first free cell in scan order, grow it right as far
+# as the row allows, then down while the whole span stays solid. Returns (x, y, w, h) in cells.
+def merge_cells(mask) -> list[tuple[int, int, int, int]]:
+    remaining = np.array(mask, dtype=bool)
+    height, width = remaining.shape
+    rects = []
+    for y in range(height):
+        row = remaining[y]
+        while True:
+            solid = np.flatnonzero(row)
+            if not len(solid):
+                break
+            x0 = int(solid[0])
+            gaps = np.flatnonzero(~row[x0:])
+            x1 = x0 + int(gaps[0]) if len(gaps) else width
+            y1 = y + 1
+            while y1 < height and remaining[y1, x0:x1].all():
+                y1 += 1
+            remaining[y:y1, x0:x1] = False
+            rects.append((x0, y, x1 - x0, y1 - y))
+    return rects
+
+def merge_rects(rects, cell_size: int) -> list[tuple[int, int, int, int]]:
+    # snaps (x, y, w, h) rects outward to the cell grid, then meshes the union
+    if not rects:
+        return []
+    bounds = np.array([(x // cell_size, y // cell_size, -(-(x + w) // cell_size), -(-(y + h) // cell_size)) for x, y, w, h in rects], dtype=int)
+    left, top = int(bounds[:, 0].min()), int(bounds[:, 1].min())
+    mask = np.zeros((bounds[:, 3].max() - top, bounds[:, 2].max() - left), dtype=bool)
+    for x0, y0, x1, y1 in bounds.tolist():
+        mask[y0 - top:y1 - top, x0 - left:x1 - left] = True
+    return [((x + left) * cell_size, (y + top) * cell_size, w * cell_size, h * cell_size) for x, y, w, h in merge_cells(mask)]
+
+# one cell of static geometry as neighbour queries see it: enough of an entity for
+# steering to read its type and get_body().position
+class StaticCell:
+    __slots__ = ("position",)
+    id = defaults.STATIC_ID
+    type = defaults.WALL_TYPE
+
+    def __init__(self, position):
+        self.position = Vec2(position)
+
+    def get_body(self):
+        return self
+
+class StaticGeometry:
+    # merged walls live as Polys on space.static_body and as pixels in a tiled layer,
+    # instead of one dynamic body, sprite and set of components per wall. With an index,
+    # every cell is also a StaticCell in it, so steering avoids walls like wall entities
+    def __init__(self, space: pymunk.Space, cell_size = 40, color = defaults.WALL_COLOR, elasticity = 0, friction = 1, tile_size = 512, index = None):
+        self.space = space
+        self.index = index
+        self.cell_size = cell_size
+        self.color = color
+        self.elasticity = elasticity
+        self.friction = friction
+        self.tile_size = tile_size
+        self.rects: list[tuple] = []
+        self.shapes: list[pymunk.Poly] = []
+        self.cells: list[StaticCell] = []
+        self.tiles: dict[tuple[int, int], pygame.Surface] = {}
+
+    def add_cells(self, mask, origin = (0, 0)) -> list[tuple]:
+        size = self.cell_size
+        return self._add([(origin[0] + x * size, origin[1] + y * size, w * size, h * size) for x, y, w, h in merge_cells(mask)])
+
+    def add_rects(self, rects) -> list[tuple]:
+        return self._add(merge_rects(rects, self.cell_size))
+
+    def _add(self, rects) -> list[tuple]:
+        for rect in rects:
+            x, y, w, h = rect
+            shape = pymunk.Poly(self.space.static_body, [(x, y), (x + w, y), (x + w, y + h), (x, y + h)])
+            shape.friction = self.friction
+            shape.elasticity = self.elasticity
+            shape.collision_type = defaults.WALL_TYPE
+            shape.entity_id = defaults.STATIC_ID
+            self.space.add(shape)
+            self.shapes.append(shape)
+            self._render(rect)
+            if self.index is not None:
+                self._index(rect)
+        self.rects += rects
+        return rects
+
+    def _index(self, rect) -> None:
+        x, y, w, h = rect
+        size = self.cell_size
+        for j in range(round(h / size)):
+            for i in range(round(w / size)):
+                cell = StaticCell((x + (i + 0.5) * size, y + (j + 0.5) * size))
+                self.index.insert_static(cell, cell.position)
+                self.cells.append(cell)
+
+    def _render(self, rect) -> None:
+        size = self.tile_size
+        area = pygame.Rect(rect)
+        for ty in range(area.top // size, (area.bottom - 1) // size + 1):
+            for tx in range(area.left // size, (area.right - 1) // size + 1):
+                tile = self.tiles.get((tx, ty))
+                if tile is None:
+                    tile = pygame.Surface((size, size), pygame.SRCALPHA)
+                    if pygame.display.get_surface() is not None:
+                        tile = tile.convert_alpha()
+                    tile.fill((0, 0, 0, 0))
+                    self.tiles[(tx, ty)] = tile
+                tile.fill(self.color, area.move(-tx * size, -ty * size))
+
+    def tiles_in(self, region: pygame.Rect):
+        size = self.tile_size
+        for ty in range(region.top // size, (region.bottom - 1) // size + 1):
+            for tx in range(region.left // size, (region.right - 1) // size + 1):
+                tile = self.tiles.get((tx, ty))
+                if tile is not None:
+                    yield pygame.Rect(tx * size, ty * size, size, size), tile
+
+    def clear(self) -> None:
+        if self.shapes:
+            self.space.remove(*self.shapes)
+        if self.cells:
+            self.index.remove_static(self.cells)
+        self.shapes.clear()
+        self.cells.clear()
+        self.rects.clear()
+        self.tiles.clear()
+
+    def __len__(self) -> int:
+        return len(self.shapes)
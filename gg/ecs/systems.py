@@ -1,9 +1,10 @@
-import uuid
-
 from dataclasses import dataclass
 from typing import List, Type
 
+import numpy as np
+
 
+from . import archetypes
 from . import entities
 from . import defaults
 from .. import structures
@@ -16,75 +17,126 @@ _Accelerator = entities.Accelerator
 @dataclass
 class System:
     component_classes: List[Type[_Component]]
-    _entity_to_components: dict[uuid.UUID, List[_Component]]
+    storage: archetypes.ArchetypeStorage
 
     
     def __init__(self, component_classes: List[Type[_Component]], entites = None):
         self.component_classes = component_classes
-        self._entity_to_components = {}
-        self._entities = list()
+        self.storage = archetypes.ArchetypeStorage(component_classes)
 
         if entites is not None:
             for entity in entites:
                 self.add(entity)
     
     def add(self, entity: _Entity) -> None:
-        components_to_add = dict()
-        for component_class in self.component_classes:
-            component = entity.get_component(component_class)
-    
-            if component is None: 
-                continue 
-            
-            components_to_add[component_class.__name__] = component
-            
-        self._entities.append(entity)
-        self._entity_to_components[entity.id] = components_to_add
+        self.storage.add(entity)
         
     def remove(self, entity: _Entity) -> None:
-        if entity in self._entities:
-            self._entities.remove(entity)
+        self.storage.remove(entity)
 
+    @property
+    def entities(self) -> archetypes.ArchetypeStorage:
+        return self.storage
                 
     def update(self, delta) -> None:
-        for entity in self._entities:
-            self._update_components(entity, delta)
+        for archetype in self.storage.archetypes():
+            self._update_chunk(archetype, delta)
 
-    def _update_components(self, entity, delta) -> None:
-        components = self._entity_to_components.get(entity.id)
-        for component in components.values():
-            component.update()
+    def _update_chunk(self, archetype: archetypes.Archetype, delta) -> None:
+        for column in archetype.columns.values():
+            for component in column:
+                component.update()
  
                 
 @dataclass
 class PhysicsSystem(System):
-    def __init__(self, entities=None):
+    batched: bool = False
+    # off when nothing draws, or when interpolate places the sprites before drawing
+    sync_sprites: bool = True
+
+    def __init__(self, entities=None, batched=False, sync_sprites=True):
         super().__init__([_Body, _Accelerator], entities)
-        
-    def update(self, delta) -> None:
-        for entity in self._entities:
-            self._update_components(entity, delta)
+        self.batched = batched
+        self.sync_sprites = sync_sprites
+        self._previous = {}
+
+    def snapshot(self) -> None:
+        previous = {}
+        for archetype in self.storage.archetypes(_Body):
+            for entity, body in zip(archetype.entities, archetype.column(_Body)):
+                pymunk_body = body.model.body
+                position = pymunk_body.position
+                previous[entity.id] = (position.x, position.y, pymunk_body.angle)
+        self._previous = previous
+
+    def interpolate(self, alpha: float) -> None:
+        for archetype in self.storage.archetypes(_Body):
+            count = len(archetype)
+            current = np.array([(body.model.body.position.x, body.model.body.position.y, body.model.body.angle) for body in archetype.column(_Body)], dtype=float).reshape(count, 3)
+            previous = np.array([self._previous.get(entity.id, state) for entity, state in zip(archetype.entities, current.tolist())], dtype=float).reshape(count, 3)
+            state = previous + (current - previous) * alpha
+            self._sync_batch(archetype.entities, state[:, :2], -state[:, 2])
 
     def _sync_to_body(self, entity, body):
         entity.rot_center(body.angle)
         entity.rect.center = body.position
     
-    def _update_components(self, entity, delta) -> None:
-        components = self._entity_to_components.get(entity.id)
-        body = components.get(_Body.__name__)
-        accelerator = components.get(_Accelerator.__name__)
-        
+    def _update_chunk(self, archetype: archetypes.Archetype, delta) -> None:
+        if self.batched:
+            self._update_chunk_batched(archetype, delta)
+            return
 
-        if accelerator is not None:
-            acceleration = accelerator.acceleration
-            direction = accelerator.direction
-            if direction is not None and acceleration > 0: 
-                body.model.apply_impulse((direction.x * acceleration, direction.y * acceleration))
-        
-            accelerator.update(delta)
+        bodies = archetype.column(_Body)
+        accelerators = archetype.column(_Accelerator)
+
+        if accelerators is not None:
+            for i, accelerator in enumerate(accelerators):
+                acceleration = accelerator.acceleration
+                direction = accelerator.direction
+                if direction is not None and acceleration > 0: 
+                    bodies[i].model.apply_impulse((direction.x * acceleration, direction.y * acceleration))
+            
+                accelerator.update(delta)
         
-        if body is not None:
-            self._sync_to_body(entity, body)
+        if bodies is not None and self.sync_sprites:
+            for entity, body in zip(archetype.entities, bodies):
+                self._sync_to_body(entity, body)
+
+    def _update_chunk_batched(self, archetype: archetypes.Archetype, delta) -> None:
+        bodies = archetype.column(_Body)
+        accelerators = archetype.column(_Accelerator)
+        if bodies is None:
+            if accelerators is not None:
+                for accelerator in accelerators:
+                    accelerator.update(delta)
+            return
+
+        count = len(bodies)
+        pymunk_bodies = [body.model.body for body in bodies]
+        positions = np.array([pymunk_body.position for pymunk_body in pymunk_bodies], dtype=float).reshape(count, 2)
+        angles = np.fromiter((pymunk_body.angle for pymunk_body in pymunk_bodies), dtype=float, count=count)
+
+        if accelerators is not None:
+            accelerations = np.fromiter((accelerator.acceleration for accelerator in accelerators), dtype=float, count=count)
+            directions = np.array([(0, 0) if accelerator.direction is None else accelerator.direction for accelerator in accelerators], dtype=float).reshape(count, 2)
+            impulses = directions * accelerations[:, None]
+
+            # pymunk only takes impulses one body at a time
+            impulse_list = impulses.tolist()
+            position_list = positions.tolist()
+            for i in np.flatnonzero(accelerations > 0).tolist():
+                pymunk_bodies[i].apply_impulse_at_world_point(impulse_list[i], position_list[i])
+
+            for accelerator in accelerators:
+                accelerator.update(delta)
+
+        if self.sync_sprites:
+            self._sync_batch(archetype.entities, positions, -angles)
+
+    def _sync_batch(self, entities, centers, angles) -> None:
+        for entity, center, angle in zip(entities, centers.tolist(), angles.tolist()):
+            entity.rot_center(angle)
+            entity.rect.center = center
 
 
     
@@ -98,10 +150,13 @@ class PhysicsSystem(System):
         else: 
             entity.velocity = structures.Vec2(0,0)
    
-    def _handle_entity_collision(self, entity):
-        for other in self._entities:
-            if other.id == entity.id:
+    def _handle_collisions(self, contacts, start = 0) -> None:
+        for contact in contacts.contacts[start:]:
+            entity, other = contacts.entities(contact)
+            if entity is None or other is None:
                 continue
-            
-            entities.collide(entity, other)
+            if entity in self.storage:
+                entity.on_collision(other, contact)
+            if other in self.storage:
+                other.on_collision(entity, contact)
     
\ No newline at end of file
@@ -7,54 +7,138 @@ import pymunk.pygame_util
 from . import style
 from . import display
 from . import structures
+from . import ecs
+from . import timestep
+from . import profiler
+from . import particles
 
 @dataclass(unsafe_hash=True)
 class Game:
     __metaclass__ = structures.IterableObject
     
     name = ""
-    entities = {}
+    entities: ecs.Registry
+    step_rate = 60
+    max_substeps = 5
+    frame_rate = 60
     style = style.GGSTYLE()
     space: pymunk.Space
     _draw_options: pymunk.pygame_util.DrawOptions
     screen: display.Screen
     
-    def __init__(self, name, width = 800, height = 600):
+    def __init__(self, name, width = 800, height = 600, headless = False):
         self.name = name
-        self.screen = display.Screen(width, height)
-        
-        pygame.init()
-        pygame.display.set_caption(name)
+        self.headless = headless
         self.space = pymunk.Space()
-        self._draw_options = pymunk.pygame_util.DrawOptions(self.screen.canvas)
-        self.clock = pygame.time.Clock()
+
+        if headless:
+            self.screen = display.HeadlessScreen(width, height)
+            self._draw_options = None
+            self.clock = timestep.SimulatedClock(1000 / self.step_rate)
+        else:
+            self.screen = display.Screen(width, height)
+            pygame.init()
+            pygame.display.set_caption(name)
+            self._draw_options = pymunk.pygame_util.DrawOptions(self.screen.canvas)
+            self.clock = pygame.time.Clock()
+        self.timestep = timestep.Timestep(1 / self.step_rate, self.max_substeps)
+        self.profiler = profiler.Profiler()
+        self.entities = ecs.Registry()
+        # sprites are placed once per frame by physics.interpolate in render, not every substep
+        self.physics = ecs.PhysicsSystem(sync_sprites=False)
+        self.neighbours = ecs.SpatialHash()
+        self.screen.index = self.neighbours
+        self.contacts = ecs.ContactBuffer(self.space, self.entities)
         
+        # effects made with engine=game.particle_engine share a budget only within this game
+        self.particle_engine = particles.ParticleEngine()
         self.particle_effects = {}
 
 
     def run(self):
         self.running = 1
+        self.timestep.reset()
         while self.running == 1:
+            self.profiler.begin_frame()
             self._handle_quit()
+            elapsed = self.clock.tick(self.frame_rate) / 1000
+            # contacts are kept for the whole frame, across every substep
+            self.contacts.clear()
+            for _ in range(self.timestep.advance(elapsed)):
+                self.fixed_update(self.timestep.step)
+            with self.profiler.phase("render"):
+                self.render(self.timestep.alpha)
+            self.profiler.end_frame()
+
+        if not self.headless:
+            pygame.quit()
+
+    def fixed_update(self, dt):
+        # the snapshot only feeds render's interpolation
+        if not self.headless:
+            self.physics.snapshot()
+        self._update_system(self.physics, dt)
+        # the buffer spans the frame, so only this step's contacts are dispatched
+        start = len(self.contacts)
+        self._update_space(dt, clear_contacts=False)
+        with self.profiler.phase("collisions"):
+            self.physics._handle_collisions(self.contacts, start)
+        with self.profiler.phase("particles"):
+            self._update_particles()
+
+    def render(self, alpha):
+        if self.headless:
+            return
+        self.physics.interpolate(alpha)
+        with self.profiler.phase("draw"):
             self.screen.clear(self.style.BLACK)
-            hello = self.style.FONT.render("hi", False, style.GGSTYLE.GREEN)
-            self.entities.draw(self.screen)
-            self.screen.blit(hello, (self.screen.width / 2 - hello.get_rect().w / 2, self.scree.height / 2 - hello.get_rect().h / 2))
+            self.screen.draw_entities(self.entities)
+            self._draw_particles()
+        overlay = self.profiler.draw_overlay(self.screen.canvas)
+        if overlay is not None:
+            self.screen.mark_dirty(overlay)
+        self.screen.update()
+        # dirty mode presents its own rects in Screen.update
+        if not self.screen.dirty:
             pygame.display.update()
-            self.clock.tick(60)
-
-        pygame.quit()
         
                     
     def _handle_quit(self):
+        if self.headless:
+            return
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = 0
     
-    def _update_space(self):
-        self.space.step(1/60)
+    def _update_system(self, system, dt):
+        with self.profiler.phase(f"{type(system).__name__}.update"):
+            system.update(dt)
+
+    def _update_space(self, dt = None, clear_contacts = True):
+        if clear_contacts:
+            self.contacts.clear()
+        with self.profiler.phase("space.step"):
+            self.space.step(dt if dt is not None else self.timestep.step)
+        with self.profiler.phase("neighbours"):
+            self._update_neighbours()
+
+    def _update_neighbours(self):
+        self.neighbours.rebuild(self.entities)
                 
     
+    def add_particle_effect(self, effect):
+        self.particle_effects[effect.id] = effect
+
+    def _update_particles(self):
+        for id, effect in list(self.particle_effects.items()):
+            effect.update()
+            if effect.completed:
+                del self.particle_effects[id]
+                effect.destroy()
+
+    def _draw_particles(self):
+        self.screen.draw_particles(*self.particle_effects.values())
+    
     def addobject(self, object):
         self.entities.addobject(object)
 
@@ -1,25 +1,61 @@
+import bisect
+import hashlib
 import random 
 
 import uuid
 
+import numpy as np
+
 from . import style
 from . import structures
 
 SEED = str(uuid.uuid1())
 random.seed(SEED)
 
+# Named streams are independent Philox generators keyed by a digest of the seed and the
+# name, so a stream's sequence depends only on (SEED, name): not on call order, other
+# consumers, or which process draws from it.
+_STREAMS: dict[str, np.random.Generator] = {}
+
+def stream_key(name, seed = None) -> int:
+    seed = SEED if seed is None else seed
+    return int.from_bytes(hashlib.blake2b(f"{seed}\x00{name}".encode(), digest_size=16).digest(), "little")
+
+def new_stream(name, seed = None) -> np.random.Generator:
+    return np.random.Generator(np.random.Philox(key=stream_key(name, seed)))
+
+def stream(name) -> np.random.Generator:
+    rng = _STREAMS.get(name)
+    if rng is None:
+        rng = _STREAMS[name] = new_stream(name)
+    return rng
+
+def _resolve(rng) -> np.random.Generator:
+    if rng is None:
+        return stream("gen")
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return stream(rng)
+
+# the scalar helpers are called one value at a time, where random.Random is much cheaper
+# than a numpy generator; it is still private to gen and derived from SEED
+_RANDOM = random.Random(stream_key("gen"))
+
 def set_seed(custom_seed):
+    global SEED
     SEED = custom_seed
     random.seed(SEED)
+    _RANDOM.seed(stream_key("gen"))
+    _STREAMS.clear()
     
 def gen_float():
-    return random.random()
+    return _RANDOM.random()
 
 def gen_range(min, max):
-    return random.uniform(min, max)
+    return _RANDOM.uniform(min, max)
 
 def gen_intrange(min, max):
-    return random.randint(min, max)
+    return _RANDOM.randint(min, max)
 
 def gen_color(alpha = None):
     return style.Color().randomized(alpha)
@@ -28,4 +64,153 @@ def gen_vec2(max_x = 1, max_y = 1, min_x = 0, min_y = 0) -> structures.Vec2:
     return structures.Vec2(gen_range(min_x, max_x), gen_range(min_y, max_y))
 
 def gen_point(max_x = 1, max_y = 1, min_x = 0, min_y = 0) -> structures.Point:
-    return structures.Point(gen_range(min_x, max_x), gen_range(min_y, max_y))
\ No newline at end of file
+    return structures.Point(gen_range(min_x, max_x), gen_range(min_y, max_y))
+
+# batched versions return arrays; rng is a stream name, a Generator, or None for "gen"
+def gen_floats(count: int, rng = None) -> np.ndarray:
+    return _resolve(rng).random(count)
+
+def gen_ranges(count: int, min, max, rng = None) -> np.ndarray:
+    return _resolve(rng).uniform(min, max, count)
+
+def gen_intranges(count: int, min, max, rng = None) -> np.ndarray:
+    return _resolve(rng).integers(min, max, count, endpoint=True)
+
+def gen_vec2s(count: int, max_x = 1, max_y = 1, min_x = 0, min_y = 0, rng = None) -> np.ndarray:
+    return _resolve(rng).uniform((min_x, min_y), (max_x, max_y), (count, 2))
+
+def gen_colors(count: int, alpha = None, rng = "color") -> np.ndarray:
+    colors = _resolve(rng).random((count, 4)) * 255
+    if alpha is not None:
+        colors[:, 3] = alpha
+    return colors
+
+
+# Noise fields are (height, width) arrays indexed [y, x], sampled at integer world cells
+# offset..offset + size. Lattice values come from hashing the lattice coordinate, so
+# neighbouring regions generated separately (e.g. chunks) line up without seams.
+
+def noise_seed(seed = None) -> int:
+    seed = SEED if seed is None else seed
+    if isinstance(seed, (int, np.integer)):
+        return int(seed) & 0xFFFFFFFFFFFFFFFF
+    return int.from_bytes(hashlib.blake2b(str(seed).encode(), digest_size=8).digest(), "little")
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer; uint64 arithmetic wraps, which is what we want
+    h ^= h >> np.uint64(33)
+    h *= np.uint64(0xFF51AFD7ED558CCD)
+    h ^= h >> np.uint64(33)
+    h *= np.uint64(0xC4CEB9FE1A85EC53)
+    h ^= h >> np.uint64(33)
+    return h
+
+def _lattice(x0: int, y0: int, width: int, height: int, seed: int) -> np.ndarray:
+    ix = np.arange(x0, x0 + width, dtype=np.int64).astype(np.uint64)
+    iy = np.arange(y0, y0 + height, dtype=np.int64).astype(np.uint64)
+    h = (ix[None, :] * np.uint64(0x9E3779B97F4A7C15)) ^ (iy[:, None] * np.uint64(0xC2B2AE3D27D4EB4F)) ^ np.uint64(seed)
+    return (_mix(h) >> np.uint64(11)) * (1.0 / (1 << 53))
+
+def _grid(width: int, height: int, scale: float, offset):
+    xs = (offset[0] + np.arange(width)) / scale
+    ys = (offset[1] + np.arange(height)) / scale
+    x0, y0 = np.floor(xs), np.floor(ys)
+    left, top = int(x0[0]), int(y0[0])
+    cols, rows = (x0 - left).astype(np.intp), (y0 - top).astype(np.intp)
+    return left, top, cols, rows, (xs - x0).astype(np.float32), (ys - y0).astype(np.float32)
+
+def _fade(t: np.ndarray) -> np.ndarray:
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+def _gather(lattice: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    return lattice.take(rows, 0).take(cols, 1)
+
+def _bilerp(c00, c10, c01, c11, u, v) -> np.ndarray:
+    # in place on the corner arrays: a full field is megabytes, so temporaries dominate
+    c10 -= c00
+    c10 *= u
+    c00 += c10
+    c11 -= c01
+    c11 *= u
+    c01 += c11
+    c01 -= c00
+    c01 *= v
+    c00 += c01
+    return c00
+
+# fields are float32 in [0, 1]
+def value_noise(width: int, height: int, scale: float = 32, seed = None, offset = (0, 0)) -> np.ndarray:
+    left, top, cols, rows, tx, ty = _grid(width, height, scale, offset)
+    lattice = _lattice(left, top, cols[-1] + 2, rows[-1] + 2, noise_seed(seed)).astype(np.float32)
+    corners = [_gather(lattice, rows + dy, cols + dx) for dy in (0, 1) for dx in (0, 1)]
+    return _bilerp(*corners, _fade(tx), _fade(ty)[:, None])
+
+def perlin_noise(width: int, height: int, scale: float = 32, seed = None, offset = (0, 0)) -> np.ndarray:
+    left, top, cols, rows, tx, ty = _grid(width, height, scale, offset)
+    angles = _lattice(left, top, cols[-1] + 2, rows[-1] + 2, noise_seed(seed)) * (2 * np.pi)
+    gx, gy = np.cos(angles).astype(np.float32), np.sin(angles).astype(np.float32)
+
+    def corner(dx, dy):
+        r, c = rows + dy, cols + dx
+        dot = _gather(gx, r, c)
+        dot *= tx - dx
+        along = _gather(gy, r, c)
+        along *= (ty - dy)[:, None]
+        dot += along
+        return dot
+
+    field = _bilerp(corner(0, 0), corner(1, 0), corner(0, 1), corner(1, 1), _fade(tx), _fade(ty)[:, None])
+    # 2D gradient noise with unit gradients stays within +-sqrt(1/2)
+    field *= np.float32(np.sqrt(0.5))
+    field += np.float32(0.5)
+    return field
+
+def fbm(width: int, height: int, scale: float = 128, octaves: int = 4, lacunarity: float = 2, gain: float = 0.5, seed = None, offset = (0, 0), noise = perlin_noise) -> np.ndarray:
+    seed = noise_seed(seed)
+    total = np.zeros((height, width), dtype=np.float32)
+    amplitude, norm = 1.0, 0.0
+    for octave in range(octaves):
+        # each octave gets its own lattice so they don't reinforce at the origin
+        layer = noise(width, height, scale, seed + octave, offset)
+        layer *= np.float32(amplitude)
+        total += layer
+        norm += amplitude
+        amplitude *= gain
+        scale /= lacunarity
+    total /= np.float32(norm)
+    return total
+
+def threshold(field: np.ndarray, level: float = 0.5, above: bool = True) -> np.ndarray:
+    return field >= level if above else field < level
+
+def flood_fill(mask: np.ndarray, start) -> np.ndarray:
+    # 4-connected fill over horizontal runs of the mask, so the work scales with the
+    # number of runs rather than the number of cells
+    mask = np.asarray(mask, dtype=bool)
+    height, width = mask.shape
+    filled = np.zeros_like(mask)
+    x, y = int(start[0]), int(start[1])
+    if not (0 <= x < width and 0 <= y < height) or not mask[y, x]:
+        return filled
+
+    edges = np.diff(np.pad(mask, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    run_rows, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+    bounds = np.searchsorted(run_rows, np.arange(height + 1)).tolist()
+    run_rows, starts, ends = run_rows.tolist(), starts.tolist(), ends.tolist()
+
+    first = bisect.bisect_right(ends, x, bounds[y], bounds[y + 1])
+    seen = {first}
+    stack = [first]
+    while stack:
+        run = stack.pop()
+        row, start, end = run_rows[run], starts[run], ends[run]
+        filled[row, start:end] = True
+        for neighbour in (row - 1, row + 1):
+            if 0 <= neighbour < height:
+                lo, hi = bounds[neighbour], bounds[neighbour + 1]
+                for other in range(bisect.bisect_right(ends, start, lo, hi), bisect.bisect_left(starts, end, lo, hi)):
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+    return filled
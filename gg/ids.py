@@ -0,0 +1,67 @@
+from collections import deque
+
+# An id packs a slot index into the low bits and that slot's generation above it.
+# Freeing a slot bumps its generation, so ids handed out before the free go stale
+# instead of silently pointing at whatever reuses the slot next.
+INDEX_BITS = 32
+INDEX_MASK = (1 << INDEX_BITS) - 1
+GENERATION_BITS = 16
+GENERATION_MASK = (1 << GENERATION_BITS) - 1
+
+def make_id(index: int, generation: int) -> int:
+    return (generation << INDEX_BITS) | index
+
+def index_of(id: int) -> int:
+    return id & INDEX_MASK
+
+def generation_of(id: int) -> int:
+    return id >> INDEX_BITS
+
+class IdAllocator:
+    # slots sit in the free queue for a while before reuse, which keeps generations
+    # from wrapping around quickly on slots that churn
+    def __init__(self, min_free = 1024):
+        self.min_free = min_free
+        self._generations: list[int] = []
+        self._alive: list[bool] = []
+        self._free = deque()
+        self._count = 0
+
+    def allocate(self) -> int:
+        if len(self._free) > self.min_free:
+            index = self._free.popleft()
+        else:
+            index = len(self._generations)
+            # generations start at 1 so no id is ever 0
+            self._generations.append(1)
+            self._alive.append(False)
+        self._alive[index] = True
+        self._count += 1
+        return make_id(index, self._generations[index])
+
+    def free(self, id: int) -> bool:
+        if not self.alive(id):
+            return False
+        index = index_of(id)
+        self._alive[index] = False
+        self._generations[index] = self._generations[index] % GENERATION_MASK + 1
+        self._free.append(index)
+        self._count -= 1
+        return True
+
+    def alive(self, id: int) -> bool:
+        index = index_of(id)
+        return index < len(self._generations) and self._alive[index] and self._generations[index] == generation_of(id)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._generations)
+
+    def __contains__(self, id: int) -> bool:
+        return self.alive(id)
+
+    def __len__(self) -> int:
+        return self._count
+
+ENTITY_IDS = IdAllocator()
+EFFECT_IDS = IdAllocator()
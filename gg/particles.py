@@ -1,62 +1,144 @@
-import random
-import uuid
-import pygame
+import weakref
+
+import numpy as np
 
 from dataclasses import dataclass
 
 from . import display
+from . import ids
+from . import gen
 
-class Particle:
-    def __init__(self, pos, dir = (1,1)):
-        self.id = uuid.uuid4()
-        self.x, self.y = pos[0], pos[1]
-        self.vx, self.vy = random.randint(-2, 2) * dir[0], random.randint(-2, 2) * dir[1]
-        self.rad = 10
+class ParticleEngine:
+    budget: int
+    live: int
 
-    def draw(self, screen: display.Screen):
-        screen.draw_particle(self)
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        if random.randint(0, 100) < 20:
-            self.rad -= 1
-            self.vx *= 0.5
-            self.vy *=  0.5
+    def __init__(self, budget = 50000):
+        self.budget = budget
+        self.live = 0
+
+    def reserve(self, count: int) -> int:
+        granted = max(0, min(count, self.budget - self.live))
+        self.live += granted
+        return granted
+
+    def release(self, count: int) -> None:
+        self.live = max(0, self.live - count)
+
+ENGINE = ParticleEngine()
+
+def _release(engine, held):
+    engine.release(held[0])
+    held[0] = 0
 
 @dataclass
 class ParticleEffect:
-    id: uuid.UUID
-    
-class Dust(ParticleEffect):
-    def __init__(self, pos, dir = (1,1)):
-        self.id = uuid.uuid4()
-        self.pos = pos
-        self.particles = {}
-        self._dead_particles = {}
-        self.completed = False
-        
-        for i in range(2):
-            particle = Particle(self.pos, (dir[0] * i, dir[1] * i))
-            self.particles[particle.id] = particle
+    id: int
+
+    def destroy(self) -> None:
+        ids.EFFECT_IDS.free(self.id)
+
+class Emitter(ParticleEffect):
+    positions: np.ndarray
+    velocities: np.ndarray
+    radii: np.ndarray
+    lifetimes: np.ndarray
+    count: int
+
+    def __init__(self, capacity = 64, engine = ENGINE):
+        self.id = ids.EFFECT_IDS.allocate()
+        self.engine = engine
+        # what this emitter holds of the engine's budget, handed back if it is dropped live
+        self._held = [0]
+        self._finalizer = weakref.finalize(self, _release, engine, self._held)
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.radii = np.zeros(capacity)
+        self.lifetimes = np.zeros(capacity)
+        self.count = 0
+        self.shrink_chance = 0.2
+        self.damping = 0.5
+
+    def emit(self, positions, velocities, radii, lifetimes = np.inf) -> int:
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        count = self.engine.reserve(len(positions))
+        if count == 0:
+            return 0
+
+        self._reserve_capacity(self.count + count)
+        start, end = self.count, self.count + count
+        self.positions[start:end] = positions[:count]
+        self.velocities[start:end] = np.broadcast_to(np.asarray(velocities, dtype=float).reshape(-1, 2), (len(positions), 2))[:count]
+        self.radii[start:end] = np.broadcast_to(radii, len(positions))[:count]
+        self.lifetimes[start:end] = np.broadcast_to(lifetimes, len(positions))[:count]
+        self.count = end
+        self._held[0] += count
+        return count
+
+    def _reserve_capacity(self, capacity: int) -> None:
+        if capacity <= len(self.radii):
+            return
+        capacity = max(capacity, 2 * len(self.radii))
+        for name in ("positions", "velocities", "radii", "lifetimes"):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:])
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
 
     def update(self):
+        count = self.count
+        if count == 0: return
+
+        positions = self.positions[:count]
+        velocities = self.velocities[:count]
+        positions += velocities
+
+        shrinking = gen.stream("particles").random(count) < self.shrink_chance
+        self.radii[:count] -= shrinking
+        velocities[shrinking] *= self.damping
+        self.lifetimes[:count] -= 1
+
+        dead = np.flatnonzero((self.radii[:count] <= 0) | (self.lifetimes[:count] <= 0))
+        if len(dead):
+            self._remove(dead)
+
+    def _remove(self, dead: np.ndarray) -> None:
+        # swap-remove: fill the dead slots with live particles from the tail
+        count = self.count
+        alive = count - len(dead)
+        keep = np.ones(count, dtype=bool)
+        keep[dead] = False
+        holes = dead[dead < alive]
+        movers = np.flatnonzero(keep[alive:]) + alive
+        for array in (self.positions, self.velocities, self.radii, self.lifetimes):
+            array[holes] = array[movers]
+        self.count = alive
+        self.engine.release(len(dead))
+        self._held[0] -= len(dead)
+
+    def clear(self) -> None:
+        _release(self.engine, self._held)
+        self.count = 0
+
+    def destroy(self) -> None:
+        self.clear()
+        super().destroy()
+
+    @property
+    def completed(self) -> bool:
+        return self.count == 0
+
+    def draw(self, screen: display.Screen):
         if self.completed: return
-        
-        for particle in self.particles.values():
-            if particle.rad <= 0: 
-                self._dead_particles[particle.id] = particle
-            else:
-                particle.update()
-        
-        if len(self._dead_particles) == len(self.particles):
-            self.completed = True
-        
-
-
-    def draw(self, win):
-        if self.completed: return
-        
-        for particle in self.particles.values():
-            particle.draw(win)
-        
\ No newline at end of file
+        screen.draw_particles(self)
+
+    def __len__(self) -> int:
+        return self.count
+
+class Dust(Emitter):
+    def __init__(self, pos, dir = (1,1), count = 2, engine = ENGINE):
+        super().__init__(count, engine)
+        self.pos = pos
+
+        spread = np.arange(count)[:, None] * np.asarray(dir, dtype=float)
+        velocities = gen.stream("particles").integers(-2, 3, (count, 2)) * spread
+        self.emit(np.broadcast_to((pos[0], pos[1]), (count, 2)), velocities, 10)
@@ -1,4 +1,3 @@
-import pygame
 import pymunk
 
 from dataclasses import dataclass
@@ -51,10 +50,13 @@ class Player(Actor):
         self.get_weapon().update()
             
         
+    # contacts are recorded on begin only: an enemy that stays touching is damaged once,
+    # not every frame as spritecollide did
     def _handle_enemy_collision(self):
-        enemies_hit = pygame.sprite.spritecollide(self, self.game.enemies, False)
-        for enemy in enemies_hit:
-            enemy.receiveDamage(10)
+        for contact in self.game.contacts.involving(self.id):
+            enemy = self.game.entities.get(contact.other(self.id))
+            if enemy is not None and enemy.type == ecs.ENEMY_TYPE:
+                enemy.receiveDamage(10)
     
     def limit_velocity(body, gravity, damping, dt):
         max_velocity = 30
@@ -0,0 +1,141 @@
+import json
+import time
+from collections import deque
+
+import pygame
+
+_clock = time.perf_counter_ns
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+# handed out while profiling is off, so a disabled phase costs one call and no allocation
+NULL_PHASE = _NullPhase()
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, _clock())
+        return False
+
+def percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class Profiler:
+    enabled: bool
+    tracing: bool
+    overlay: bool
+
+    def __init__(self, enabled = False, window = 300, tracing = False, max_events = 200000):
+        self.enabled = enabled
+        self.tracing = tracing
+        self.overlay = False
+        self.window = window
+        self.max_events = max_events
+        self.frames = deque(maxlen=window)
+        self.phases: dict[str, deque] = {}
+        self.events = []
+        self._current = {}
+        self._frame_start = None
+        self._origin = _clock()
+        self._font = None
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return NULL_PHASE
+        return _Phase(self, name)
+
+    def _record(self, name: str, start: int, end: int) -> None:
+        self._current[name] = self._current.get(name, 0) + (end - start)
+        if self.tracing and len(self.events) < self.max_events:
+            self.events.append((name, start, end - start))
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+        self._frame_start = _clock()
+
+    def end_frame(self) -> None:
+        if not self.enabled or self._frame_start is None:
+            return
+        self._record("frame", self._frame_start, _clock())
+        self.frames.append(self._current.pop("frame") / 1e6)
+        for name, total in self._current.items():
+            samples = self.phases.get(name)
+            if samples is None:
+                samples = self.phases[name] = deque(maxlen=self.window)
+            samples.append(total / 1e6)
+        self._current.clear()
+        self._frame_start = None
+
+    def summary(self, samples) -> dict:
+        return {
+            "mean": sum(samples) / len(samples) if samples else 0.0,
+            "p50": percentile(samples, 0.50),
+            "p95": percentile(samples, 0.95),
+            "p99": percentile(samples, 0.99),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "frame": self.summary(self.frames),
+            "phases": {name: self.summary(samples) for name, samples in self.phases.items()},
+        }
+
+    def reset(self) -> None:
+        self.frames.clear()
+        self.phases.clear()
+        self.events.clear()
+        self._current.clear()
+        self._frame_start = None
+        self._origin = _clock()
+
+    def export_trace(self, path: str) -> None:
+        # Chrome trace-event format, loadable in chrome://tracing or Perfetto
+        events = [
+            {"name": name, "ph": "X", "ts": (start - self._origin) / 1000, "dur": duration / 1000, "pid": 0, "tid": 0}
+            for name, start, duration in self.events
+        ]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    # returns the area drawn over, or None, so dirty-rect screens can present it
+    def draw_overlay(self, surface: pygame.Surface, position = (8, 8), color = (255, 255, 255)) -> pygame.Rect:
+        if not self.enabled or not self.overlay:
+            return None
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(pygame.font.get_default_font(), 14)
+
+        stats = self.stats()
+        lines = ["frame  p50 {p50:6.2f}  p95 {p95:6.2f}  p99 {p99:6.2f} ms".format(**stats["frame"])]
+        phases = sorted(stats["phases"].items(), key=lambda item: item[1]["p95"], reverse=True)
+        for name, summary in phases[:8]:
+            lines.append("{:<22} p95 {:6.2f} ms".format(name, summary["p95"]))
+
+        x, y = position
+        area = pygame.Rect(x, y, 0, 0)
+        for line in lines:
+            text = self._font.render(line, True, color)
+            area.union_ip(surface.blit(text, (x, y)))
+            y += text.get_height() + 2
+        return area
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+import math
+
+import pygame
+
+RECT = "rect"
+CIRCLE = "circle"
+
+
+class SurfaceCache:
+    alpha_levels: int
+    max_bytes: int
+
+    def __init__(self, alpha_levels: int = 32, max_bytes: int = 16 * 1024 * 1024):
+        self.alpha_levels = alpha_levels
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._surfaces = OrderedDict()
+
+    def quantize_alpha(self, alpha: float) -> int:
+        step = 255 / (self.alpha_levels - 1)
+        return min(255, max(0, int(round(round(alpha / step) * step))))
+
+    def key(self, size, color, shape: str = RECT) -> tuple:
+        alpha = self.quantize_alpha(color[3]) if len(color) > 3 else 255
+        return (int(size[0]), int(size[1])), (int(color[0]), int(color[1]), int(color[2]), alpha), shape
+
+    def get(self, size, color, shape: str = RECT) -> pygame.Surface:
+        key = self.key(size, color, shape)
+        entry = self._surfaces.get(key)
+        if entry is not None:
+            self._surfaces.move_to_end(key)
+            return entry[0]
+
+        # evicted surfaces stay valid for whoever holds them, they just aren't shared anymore
+        surface = self._render(*key)
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self._surfaces[key] = (surface, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            self.bytes -= self._surfaces.popitem(last=False)[1][1]
+        return surface
+
+    def _render(self, size, color, shape) -> pygame.Surface:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        # convert_alpha needs a display; headless games keep the plain SRCALPHA surface
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        if shape == CIRCLE:
+            surface.fill((0, 0, 0, 0))
+            pygame.draw.ellipse(surface, color, surface.get_rect())
+        else:
+            surface.fill(color)
+        return surface
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+
+class StampCache:
+    def __init__(self):
+        self._stamps = {}
+
+    def get(self, radius: int, color) -> pygame.Surface:
+        key = (radius, (int(color[0]), int(color[1]), int(color[2])))
+        stamp = self._stamps.get(key)
+        if stamp is None:
+            stamp = self._stamps[key] = self._render(*key)
+        return stamp
+
+    def _render(self, radius: int, color) -> pygame.Surface:
+        # a colorkey keeps the stamp opaque, matching draw.circle on the canvas
+        colorkey = (255, 0, 255) if color != (255, 0, 255) else (0, 255, 0)
+        stamp = pygame.Surface((radius * 2, radius * 2))
+        stamp.fill(colorkey)
+        stamp.set_colorkey(colorkey, pygame.RLEACCEL)
+        pygame.draw.circle(stamp, color, (radius, radius), radius)
+        return stamp
+
+    def clear(self) -> None:
+        self._stamps.clear()
+
+    def __len__(self) -> int:
+        return len(self._stamps)
+
+
+class RotationCache:
+    resolution: float
+    max_bytes: int
+
+    def __init__(self, resolution: float = 2, max_bytes: int = 16 * 1024 * 1024):
+        self.resolution = resolution
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._frames = OrderedDict()
+
+    @property
+    def steps(self) -> int:
+        return max(1, round(360 / self.resolution))
+
+    def quantize(self, angle: float) -> int:
+        return round(math.degrees(angle) / self.resolution) % self.steps
+
+    def get(self, image: pygame.Surface, step: int) -> pygame.Surface:
+        key = (id(image), step)
+        frame = self._frames.get(key)
+        # the base image is kept in the entry so its id can't be reused while cached
+        if frame is not None and frame[0] is image:
+            self._frames.move_to_end(key)
+            return frame[1]
+        if frame is not None:
+            self._evict(key)
+
+        rotated = pygame.transform.rotozoom(image, step * self.resolution, 1)
+        size = rotated.get_width() * rotated.get_height() * rotated.get_bytesize()
+        self._frames[key] = (image, rotated, size)
+        self.bytes += size
+
+        while self.bytes > self.max_bytes and len(self._frames) > 1:
+            self._evict(next(iter(self._frames)))
+        return rotated
+
+    def rotate(self, image: pygame.Surface, angle: float) -> pygame.Surface:
+        return self.get(image, self.quantize(angle))
+
+    def _evict(self, key) -> None:
+        self.bytes -= self._frames.pop(key)[2]
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+SURFACES = SurfaceCache()
+STAMPS = StampCache()
+ROTATIONS = RotationCache()
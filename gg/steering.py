@@ -0,0 +1,122 @@
+import numpy as np
+
+from multiprocessing import shared_memory
+
+# Enemy steering as array code over a flat world snapshot, so it can run in worker
+# processes. This module only needs numpy: spawned workers import nothing else from gg.
+#
+# header: entity count, enemy count, bullet count, has player, player x, player y, screen width
+# rows: enemies, then bullets, then everything else; each section sorted by cell_keys
+#       x, y, type, color flags, max acceleration, base max acceleration, roll
+# output per enemy: move x, move y, max acceleration, touched
+HEADER = 8
+COLUMNS = 7
+OUTPUTS = 4
+X, Y, TYPE, FLAGS, MAX, BASE, ROLL = range(COLUMNS)
+YELLOW, GREEN, RED = 1, 2, 4
+
+ENEMY_RADIUS = 400
+NEAR_RADIUS = 200
+AVOID_RADIUS = 75
+BLOCK = 1024
+
+def layout_size(capacity: int) -> int:
+    return 8 * (HEADER + capacity * (COLUMNS + OUTPUTS))
+
+def views(buffer, capacity: int):
+    header = np.ndarray((HEADER,), dtype=float, buffer=buffer)
+    rows = np.ndarray((capacity, COLUMNS), dtype=float, buffer=buffer, offset=8 * HEADER)
+    out = np.ndarray((capacity, OUTPUTS), dtype=float, buffer=buffer, offset=8 * (HEADER + capacity * COLUMNS))
+    return header, rows, out
+
+# Broadphase: a section sorted by the key of its cell_size == radius grid has every point
+# within radius of an origin in the 3x3 cells around the origin's cell, and each cell is
+# one contiguous run found with searchsorted.
+def cell_keys(points: np.ndarray, cell_size: float) -> np.ndarray:
+    cells = np.floor(np.asarray(points, dtype=float).reshape(-1, 2) / cell_size).astype(np.int64)
+    return (cells[:, 0] << 32) + cells[:, 1]
+
+def _candidates(origins: np.ndarray, targets: np.ndarray, keys: np.ndarray, radius: float):
+    base = cell_keys(origins, radius)
+    lows, counts = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            key = base + (dx << 32) + dy
+            low = np.searchsorted(keys, key, "left")
+            lows.append(low)
+            counts.append(np.searchsorted(keys, key, "right") - low)
+    lows, counts = np.concatenate(lows), np.concatenate(counts)
+    # expand the (origin, run) pairs into one (origin, target) pair per candidate
+    source = np.repeat(np.tile(np.arange(len(origins)), 9), counts)
+    target = np.repeat(lows - (np.cumsum(counts) - counts), counts) + np.arange(int(counts.sum()))
+    difference = targets[target] - origins[source]
+    distance = np.sqrt((difference ** 2).sum(axis=1))
+    return source, difference, distance
+
+def _pushes(origins: np.ndarray, targets: np.ndarray, keys: np.ndarray, radius: float):
+    # unit vectors from each origin towards every other point within radius, summed
+    count = len(origins)
+    source, difference, distance = _candidates(origins, targets, keys, radius)
+    inside = (distance > 0) & (distance < radius)
+    weight = inside / np.where(inside, distance, 1)
+    push = np.stack((np.bincount(source, difference[:, 0] * weight, count), np.bincount(source, difference[:, 1] * weight, count)), axis=1)
+    return push, source, distance, inside
+
+def steer(header: np.ndarray, rows: np.ndarray, out: np.ndarray, start: int, stop: int) -> None:
+    count, enemy_count, bullet_count, has_player, player_x, player_y, width, _ = header.tolist()
+    count, enemy_count, bullet_count = int(count), int(enemy_count), int(bullet_count)
+    enemies = rows[:enemy_count, :2]
+    bullets = rows[enemy_count:enemy_count + bullet_count, :2]
+    others = rows[enemy_count + bullet_count:count, :2]
+    enemy_keys = cell_keys(enemies, ENEMY_RADIUS)
+    bullet_keys = cell_keys(bullets, AVOID_RADIUS)
+    other_keys = cell_keys(others, AVOID_RADIUS)
+
+    for block in range(start, stop, BLOCK):
+        chunk = rows[block:min(stop, block + BLOCK)]
+        positions = chunk[:, :2]
+        flags = chunk[:, FLAGS].astype(np.int64)
+        base = chunk[:, BASE]
+        size = len(chunk)
+        move = np.zeros_like(positions)
+
+        if has_player:
+            difference = np.array((player_x, player_y)) - positions
+            distance = np.sqrt((difference ** 2).sum(axis=1))
+            normal = difference / np.where(distance > 0, distance, 1)[:, None]
+            speed = 1 + 4 * ((flags & YELLOW) != 0) + 4 * ((distance < width / 4) & (chunk[:, ROLL] < 5))
+            speed = np.where(flags & GREEN, -speed, speed)
+            speed = np.where(distance > width / 2, 4, speed)
+            move += normal * np.where(distance > 0, speed, 0)[:, None]
+
+        push, source, distance, inside = _pushes(positions, enemies, enemy_keys, ENEMY_RADIUS)
+        # like the spatial query: max acceleration resets unless every enemy is in range
+        crowded = np.bincount(source, distance <= ENEMY_RADIUS, size) >= enemy_count
+        max_acceleration = np.where(crowded, chunk[:, MAX], base)
+        near = inside & (distance < NEAR_RADIUS)
+        neighbours = np.bincount(source, inside, size)
+        close = np.bincount(source, near, size)
+        max_acceleration = max_acceleration + base * (0.001 * (neighbours - close) + 0.002 * close)
+        move += push * 0.5
+
+        push = _pushes(positions, bullets, bullet_keys, AVOID_RADIUS)[0]
+        move -= push * np.where(flags & RED, 8, 1)[:, None]
+        move -= _pushes(positions, others, other_keys, AVOID_RADIUS)[0]
+
+        rows_out = out[block:block + size]
+        rows_out[:, :2] = move
+        rows_out[:, 2] = max_acceleration
+        rows_out[:, 3] = neighbours > 0
+
+# worker side: attach once per process, then each task is just a slice of enemies
+_shared = {}
+
+def _attach(name: str, capacity: int) -> None:
+    block = shared_memory.SharedMemory(name=name)
+    _shared["block"] = block
+    _shared["views"] = views(block.buf, capacity)
+
+def _run_slice(start: int, stop: int) -> int:
+    header, rows, out = _shared["views"]
+    steer(header, rows, out, start, stop)
+    return stop - start
@@ -1,14 +1,8 @@
 from dataclasses import dataclass
 from typing import NamedTuple
 
-from . import gen
-
 import pygame
 
-pygame.init()
-
-
-
 @dataclass
 class Color:
     r: int = 255
@@ -24,10 +18,8 @@ class Color:
         return color[0] == other[0] and color[1] == other[1] and color[2] == other[2]
     
     def randomized(self, alpha = None):
-        self.r = gen.gen_float() * 255
-        self.g = gen.gen_float() * 255
-        self.b = gen.gen_float() * 255
-        self.a = gen.gen_float() * 255 if alpha is None else alpha
+        from . import gen
+        self.r, self.g, self.b, self.a = gen.gen_colors(1, alpha)[0].tolist()
         
         return (self.r, self.g, self.b, self.a)
     
@@ -43,13 +35,17 @@ class STYLE():
     FONT_SIZE: int = 36
     
     def __init__(self):
-        self._FONT = self._generate_font()
+        self._FONT = None
     
     def _generate_font(self):
+        if not pygame.font.get_init():
+            pygame.font.init()
         return pygame.font.Font(pygame.font.get_default_font(), self.FONT_SIZE)
     
     @property
     def FONT(self): 
+        if self._FONT is None:
+            self._FONT = self._generate_font()
         return self._FONT
   
 # PYGG Palette https://coolors.co/464d77-36827f-f9db6d-f4eded-ff5d73  
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+
+@dataclass
+class Timestep:
+    step: float = 1 / 60
+    max_substeps: int = 5
+    accumulator: float = 0
+
+    def advance(self, elapsed: float) -> int:
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_substeps:
+            # drop the time we can't catch up on instead of spiralling
+            steps = self.max_substeps
+            self.accumulator = self.accumulator % self.step
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.step
+
+    def reset(self) -> None:
+        self.accumulator = 0
+
+class SimulatedClock:
+    def __init__(self, step_ms: float = 1000 / 60):
+        self.step_ms = step_ms
+        self.ticks = 0
+        self._time = 0
+
+    def tick(self, framerate = 0) -> float:
+        self.ticks += 1
+        self._time = self.step_ms
+        return self._time
+
+    def get_time(self) -> float:
+        return self._time
+
+    def get_rawtime(self) -> float:
+        return self._time
+
+    def get_fps(self) -> float:
+        return 1000 / self.step_ms